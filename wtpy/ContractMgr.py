@@ -9,12 +9,8 @@
 2. ContractMgr：合约信息管理器，负责加载、存储和查询合约信息
 """
 
-# 导入JSON处理模块
-import json
-# 导入YAML处理模块
-import yaml
-# 导入字符编码检测模块
-import chardet
+# 导入基础数据文件读取函数
+from wtpy.WtUtilDefs import read_map_file, read_map_files
 
 # 导入品种管理器和品种信息类
 from .ProductMgr import ProductMgr, ProductInfo
@@ -101,24 +97,27 @@ class ContractMgr:
         
         @fname: 配置文件路径，支持.json和.yaml格式
         """
-        # 以二进制模式打开文件
-        f = open(fname, 'rb')
-        # 读取文件内容
-        content = f.read()
-        # 关闭文件
-        f.close()
-        # 检测文件编码（检测前500字节）
-        encoding = chardet.detect(content[:500])["encoding"]
-        # 将文件内容解码为字符串
-        content = content.decode(encoding)
+        self.load_map(read_map_file(fname))
 
-        # 根据文件扩展名选择解析方式
-        if fname.lower().endswith(".yaml"):
-            # YAML格式文件，使用yaml模块解析
-            exchgMap = yaml.full_load(content)
-        else:
-            # JSON格式文件，使用json模块解析
-            exchgMap = json.loads(content)
+    def load_files(self, fnames:list, maxWorkers:int = 8):
+        """
+        从多个文件加载合约信息
+        
+        多个文件时用线程池并行读取和解析，再按文件顺序依次合并，结果和逐个调用load一致。
+        
+        @fnames: 配置文件路径列表
+        @maxWorkers: 最多使用的线程数，默认为8
+        """
+        # 合并会修改索引，在当前线程中按顺序进行
+        for exchgMap in read_map_files(fnames, maxWorkers=maxWorkers):
+            self.load_map(exchgMap)
+
+    def load_map(self, exchgMap:dict):
+        """
+        从已经解析好的字典加载合约信息
+        
+        @exchgMap: 合约信息字典，格式为{交易所: {合约代码: {name: 名称, product: 品种, ...}}}
+        """
         # 遍历所有交易所
         for exchg in exchgMap:
             # 获取该交易所下的所有合约
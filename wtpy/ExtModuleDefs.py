@@ -268,7 +268,8 @@ class BaseExtDataDumper:
         
         @stdCode: 合约代码，格式如CFFEX.IF.2106
         @period: 周期，例如：m1（1分钟）、m5（5分钟）、d1（日线）
-        @bars: K线数据指针，类型为POINTER(WTSBarStruct)
+        @bars: K线数据指针，类型为POINTER(WTSBarStruct)，可以用WTSBarStruct.as_ndarray(bars, count)直接转成NumPy数组，
+                或者用WTSBarStruct.array_tobytes(bars, count)取得原始字节直接落盘
         @count: 数据条数
         @return: 如果成功导出数据返回True，否则返回False
         """
@@ -284,7 +285,8 @@ class BaseExtDataDumper:
         
         @stdCode: 合约代码，格式如CFFEX.IF.2106
         @uDate: 日期，格式如yyyymmdd，例如：20230101
-        @ticks: Tick数据指针，类型为POINTER(WTSTickStruct)
+        @ticks: Tick数据指针，类型为POINTER(WTSTickStruct)，可以用WTSTickStruct.as_ndarray(ticks, count)直接转成NumPy数组，
+                或者用WTSTickStruct.array_tobytes(ticks, count)取得原始字节直接落盘
         @count: 数据条数
         @return: 如果成功导出数据返回True，否则返回False
         """
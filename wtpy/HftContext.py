@@ -144,7 +144,7 @@ class HftContext:
         # 将K线数据存储到缓存字典中
         self.__bar_cache__[key] = npBars
 
-    def on_tick(self, stdCode:str, newTick:POINTER(WTSTickStruct)):
+    def on_tick(self, stdCode:str, newTick:WTSTickStruct):
         """
         Tick数据回调函数（由底层调用）
         
@@ -152,10 +152,10 @@ class HftContext:
         此函数会将C结构体转换为Python字典，然后调用策略对象的on_tick方法。
         
         @stdCode: 合约代码，例如：SHFE.rb.2305
-        @newTick: Tick数据指针，指向WTSTickStruct结构体
+        @newTick: Tick数据结构体，由包装器通过WTSTickStruct.from_address映射而来
         """
         # 调用策略对象的on_tick方法，将C结构体转换为字典
-        self.__stra_info__.on_tick(self, stdCode, newTick.contents.to_dict)
+        self.__stra_info__.on_tick(self, stdCode, newTick.to_dict)
 
     def on_order_queue(self, stdCode:str, newOrdQue:POINTER(WTSOrdQueStruct)):
         """
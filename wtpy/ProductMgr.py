@@ -9,14 +9,8 @@
 2. ProductMgr：品种信息管理器，负责加载、存储和查询品种信息
 """
 
-# 导入JSON处理模块
-import json
-# 导入YAML处理模块
-import yaml
-# 导入操作系统接口模块
-import os
-# 导入字符编码检测模块
-import chardet
+# 导入基础数据文件读取函数
+from wtpy.WtUtilDefs import read_map_file, read_map_files
 
 class ProductInfo:
     """
@@ -74,29 +68,31 @@ class ProductMgr:
         支持JSON和YAML两种格式的配置文件。
         文件格式应为：{交易所: {品种代码: {name: 名称, session: 时段, ...}}}
         
-        @fname: 配置文件路径，支持.json和.yaml格式
+        @fname: 配置文件路径，支持.json和.yaml格式，文件不存在时忽略
         """
-        # 检查文件是否存在，如果不存在则直接返回
-        if not os.path.exists(fname):
-            return
-        # 以二进制模式打开文件
-        f = open(fname, 'rb')
-        # 读取文件内容
-        content = f.read()
-        # 关闭文件
-        f.close()
-        # 检测文件编码（检测前500字节）
-        encoding = chardet.detect(content[:500])["encoding"]
-        # 将文件内容解码为字符串
-        content = content.decode(encoding)
+        self.load_map(read_map_file(fname, missingOk=True))
+
+    def load_files(self, fnames:list, maxWorkers:int = 8):
+        """
+        从多个文件加载品种信息
+        
+        多个文件时用线程池并行读取和解析，再按文件顺序依次合并，结果和逐个调用load一致。
+        
+        @fnames: 配置文件路径列表
+        @maxWorkers: 最多使用的线程数，默认为8
+        """
+        # 合并在当前线程中按顺序进行
+        for exchgMap in read_map_files(fnames, missingOk=True, maxWorkers=maxWorkers):
+            self.load_map(exchgMap)
 
-        # 根据文件扩展名选择解析方式
-        if fname.lower().endswith(".yaml"):
-            # YAML格式文件，使用yaml模块解析
-            exchgMap = yaml.full_load(content)
-        else:
-            # JSON格式文件，使用json模块解析
-            exchgMap = json.loads(content)
+    def load_map(self, exchgMap:dict):
+        """
+        从已经解析好的字典加载品种信息
+        
+        @exchgMap: 品种信息字典，格式为{交易所: {品种代码: {name: 名称, session: 时段, ...}}}，为None时忽略
+        """
+        if exchgMap is None:
+            return
 
         # 遍历所有交易所
         for exchg in exchgMap:
@@ -15,10 +15,8 @@
 import math
 # 导入JSON处理模块
 import json
-# 导入YAML处理模块
-import yaml
-# 导入字符编码检测模块
-import chardet
+# 导入基础数据文件读取函数
+from wtpy.WtUtilDefs import read_map_file
 
 class SectionInfo:
     """
@@ -447,24 +445,8 @@ class SessionMgr:
         
         @fname: 配置文件路径，支持.json和.yaml格式
         """
-        # 以二进制模式打开文件
-        f = open(fname, 'rb')
-        # 读取文件内容
-        content = f.read()
-        # 关闭文件
-        f.close()
-        # 检测文件编码（检测前500字节）
-        encoding = chardet.detect(content[:500])["encoding"]
-        # 将文件内容解码为字符串
-        content = content.decode(encoding)
-
-        # 根据文件扩展名选择解析方式
-        if fname.lower().endswith(".yaml"):
-            # YAML格式文件，使用yaml模块解析
-            sessions_dict = yaml.full_load(content)
-        else:
-            # JSON格式文件，使用json模块解析
-            sessions_dict = json.loads(content)
+        # 读取并解析文件
+        sessions_dict = read_map_file(fname)
         # 遍历所有时段配置
         for sid in sessions_dict:
             # 如果时段已存在，跳过（避免重复加载）
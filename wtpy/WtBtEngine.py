@@ -12,7 +12,7 @@
 5. 回测控制：启动和停止回测，支持单步执行（用于强化学习训练）
 
 设计模式：
-- 使用单例模式，确保整个应用只有一个回测引擎实例
+- 按引擎类型缓存实例，同一类型的回测引擎在进程内只初始化一次
 - 通过WtBtWrapper与C++底层交互，封装底层接口调用
 - 支持增量回测，可以基于之前的回测结果继续回测
 """
@@ -29,10 +29,10 @@ from wtpy.StrategyDefs import BaseCtaStrategy, BaseSelStrategy, BaseHftStrategy
 from wtpy.ExtToolDefs import BaseIndexWriter
 # 导入引擎类型枚举
 from wtpy.WtCoreDefs import EngineType
-# 导入单例装饰器
-from wtpy.WtUtilDefs import singleton
 # 导入扩展模块基类
 from wtpy.ExtModuleDefs import BaseExtDataLoader
+# 导入JSON转换函数和配置文件解码函数
+from wtpy.WtUtilDefs import to_json, to_json_bytes, decode_text
 
 # 导入管理器类
 from .ProductMgr import ProductMgr, ProductInfo
@@ -43,21 +43,44 @@ from .ContractMgr import ContractMgr, ContractInfo
 from .CodeHelper import CodeHelper
 
 # 导入标准库模块
+# yaml仅在读取配置文件时才用到，改为在使用处延迟导入，减少引擎模块的导入开销
 import json  # JSON格式处理
-import yaml  # YAML格式处理
-import chardet  # 字符编码检测
+import mmap  # 内存映射文件
 import os  # 操作系统接口
 
-@singleton
 class WtBtEngine:
     """
-    回测引擎类（单例模式）
-    
+    回测引擎类（按引擎类型缓存实例）
+
     负责管理回测策略、配置、数据加载、回测执行等核心功能。
     支持CTA、HFT、SEL三种类型的策略回测。
     支持单步执行模式，用于强化学习训练场景。
+    一个进程只会创建一个实例，重复构造会直接返回已有实例，不会重复初始化底层引擎。
+    底层回测模块和WtBtWrapper全进程共享，回调只会转给第一个引擎，所以同一进程中不能再创建其他类型的引擎。
     """
 
+    # 已创建的引擎实例，键为引擎类型，值为引擎实例，最多只有一个
+    _instances = dict()
+
+    def __new__(cls, eType:EngineType = EngineType.ET_CTA, *args, **kwargs):
+        """
+        创建引擎实例
+
+        如果该引擎类型已经创建过实例，则直接返回已有实例。
+
+        @eType: 引擎类型
+        @return: 对应引擎类型的引擎实例
+        @raise Exception: 如果已经创建过其他类型的引擎则抛出异常
+        """
+        # 已经创建过其他类型的引擎，底层回调无法区分引擎，直接报错
+        if len(cls._instances) > 0 and eType not in cls._instances:
+            created = next(iter(cls._instances))
+            raise Exception("WtBtEngine of %s already created, cannot create %s in the same process" % (EngineType(created).name, EngineType(eType).name))
+        # 如果该引擎类型还没有创建过实例，则创建新实例并缓存
+        if eType not in cls._instances:
+            cls._instances[eType] = super().__new__(cls)
+        return cls._instances[eType]
+
     def __init__(self, eType:EngineType = EngineType.ET_CTA, logCfg:str = "logcfgbt.yaml", isFile:bool = True, bDumpCfg:bool = False, outDir:str = "./outputs_bt"):
         """
         构造函数
@@ -70,6 +93,11 @@ class WtBtEngine:
         @bDumpCfg: 回测的实际配置文件是否落地，默认为False
         @outDir: 回测数据输出目录，默认为"./outputs_bt"
         """
+        # 实例已经初始化过，直接返回，避免重复初始化底层引擎
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+
         # 是否为回测模式标志，回测引擎为True
         self.is_backtest = True
 
@@ -92,6 +120,10 @@ class WtBtEngine:
         
         # 当前交易日，格式yyyymmdd
         self.trading_day = 0
+        # 当前交易日的合约信息缓存，键为合约代码，值为ContractInfo对象（无效合约为None）
+        self.__contract_cache__ = dict()
+        # 当前交易日的全部有效合约代码列表，首次查询时生成
+        self.__all_codes__ = None
 
         # 扩展历史数据加载器，用于从外部数据源加载历史数据
         self.__ext_data_loader__:BaseExtDataLoader = None
@@ -196,29 +228,16 @@ class WtBtEngine:
         # 检查并补充默认配置项
         self.__check_config__()
 
-        # 如果提供了合约文件路径，则更新配置
-        if contractfile is not None:
-            self.__config__["replayer"]["basefiles"]["contract"] = os.path.join(folder, contractfile)
-        
-        # 如果提供了交易时段文件路径，则更新配置
-        if sessionfile is not None:
-            self.__config__["replayer"]["basefiles"]["session"] = os.path.join(folder, sessionfile)
-
-        # 如果提供了品种文件路径，则更新配置
-        if commfile is not None:
-            self.__config__["replayer"]["basefiles"]["commodity"] = os.path.join(folder, commfile)
-
-        # 如果提供了节假日文件路径，则更新配置
-        if holidayfile is not None:
-            self.__config__["replayer"]["basefiles"]["holiday"] = os.path.join(folder, holidayfile)
-
-        # 如果提供了主力合约配置文件路径，则更新配置
-        if hotfile is not None:
-            self.__config__["replayer"]["basefiles"]["hot"] = os.path.join(folder, hotfile)
-
-        # 如果提供了秒线配置文件路径，则更新配置
-        if secondfile is not None:
-            self.__config__["replayer"]["basefiles"]["second"] = os.path.join(folder, secondfile)
+        # 汇总传入的基础文件路径，只更新提供了的项
+        basefiles = self.__config__["replayer"]["basefiles"]
+        basefiles.update({key: os.path.join(folder, fname) for key, fname in (
+                ("contract", contractfile),     # 合约文件
+                ("session", sessionfile),       # 交易时段文件
+                ("commodity", commfile),        # 品种文件
+                ("holiday", holidayfile),       # 节假日文件
+                ("hot", hotfile),               # 主力合约配置文件
+                ("second", secondfile)          # 秒线配置文件
+            ) if fname is not None})
 
         # 创建品种管理器实例
         self.productMgr = ProductMgr()
@@ -236,6 +255,9 @@ class WtBtEngine:
 
         # 创建合约管理器实例，传入品种管理器引用
         self.contractMgr = ContractMgr(self.productMgr)
+        # 合约管理器重建以后，清空合约信息缓存
+        self.__contract_cache__ = dict()
+        self.__all_codes__ = None
         # 如果合约文件路径是字符串（单个文件）
         if type(self.__config__["replayer"]["basefiles"]["contract"]) == str:
             # 加载单个合约文件
@@ -273,16 +295,18 @@ class WtBtEngine:
         @hotfile: 主力合约配置文件路径，如果为None则使用配置文件中的路径
         @secondfile: 秒线配置文件路径，如果为None则使用配置文件中的路径
         """
-        # 以二进制模式打开配置文件
-        f = open(cfgfile, "rb")
-        # 读取文件内容
-        content = f.read()
-        # 关闭文件
-        f.close()
-        # 检测文件编码（检测前500字节）
-        encoding = chardet.detect(content[:500])["encoding"]
-        # 使用检测到的编码解码文件内容
-        content = content.decode(encoding)
+        # 延迟导入YAML解析模块，只有从配置文件初始化时才需要
+        import yaml
+
+        # 以二进制模式打开配置文件，通过内存映射读取，直接从映射内存解码，不再先整体读入bytes
+        with open(cfgfile, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # 空文件无法映射，直接当作空内容处理
+                content = ""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # 按BOM、UTF-8、GBK的顺序判断编码并解码，与实盘引擎读取配置文件的方式一致
+                    content = decode_text(mm)
 
         # 根据文件扩展名判断文件格式
         if cfgfile.lower().endswith(".json"):
@@ -466,8 +490,8 @@ class WtBtEngine:
         if self.__cfg_commited__:
             return
 
-        # 将配置字典转换为格式化的JSON字符串
-        cfgfile = json.dumps(self.__config__, indent=4, sort_keys=True)
+        # 将配置字典转换为紧凑的JSON字节串，底层会重新解析，不需要缩进和排序
+        cfgfile = to_json_bytes(self.__config__)
         # 调用底层接口提交回测配置（第二个参数False表示传入的是字符串而非文件路径）
         self.__wrapper__.config_backtest(cfgfile, False)
         # 标记配置已提交
@@ -477,6 +501,8 @@ class WtBtEngine:
         if self.__dump_config__:
             # 如果是YAML格式
             if self.__is_cfg_yaml__:
+                # 延迟导入YAML模块
+                import yaml
                 # 打开文件准备写入
                 f = open("config_run.yaml", 'w')
                 # 将配置字典转换为YAML格式并写入文件
@@ -486,9 +512,9 @@ class WtBtEngine:
             else:
                 # 如果是JSON格式
                 # 打开文件准备写入
-                f = open("config_run.json", 'w')
-                # 写入JSON字符串
-                f.write(cfgfile)
+                f = open("config_run.json", 'w', encoding="utf-8")
+                # 落地的文件需要方便阅读，写入格式化的JSON字符串
+                f.write(to_json(self.__config__, pretty=True))
                 # 关闭文件
                 f.close()
 
@@ -546,8 +572,15 @@ class WtBtEngine:
         @code: 合约代码，格式如SHFE.rb.HOT
         @return: ContractInfo对象，如果找不到或不在有效期内则返回None
         """
-        # 调用合约管理器获取合约信息，传入当前交易日
-        return self.contractMgr.getContractInfo(code, self.trading_day)
+        # 优先从当前交易日的缓存中读取
+        cache = self.__contract_cache__
+        if code in cache:
+            return cache[code]
+
+        # 缓存未命中，调用合约管理器获取合约信息，传入当前交易日，并缓存结果
+        cInfo = self.contractMgr.getContractInfo(code, self.trading_day)
+        cache[code] = cInfo
+        return cInfo
 
     def getAllCodes(self) -> list:
         """
@@ -557,8 +590,12 @@ class WtBtEngine:
         
         @return: 合约代码列表
         """
-        # 调用合约管理器获取全部合约代码，传入当前交易日
-        return self.contractMgr.getTotalCodes(self.trading_day)
+        # 当前交易日第一次查询时，调用合约管理器获取全部合约代码并缓存
+        if self.__all_codes__ is None:
+            self.__all_codes__ = self.contractMgr.getTotalCodes(self.trading_day)
+
+        # 返回缓存列表的副本，避免调用方修改缓存
+        return self.__all_codes__.copy()
 
     def getRawStdCode(self, stdCode:str):
         """
@@ -761,6 +798,9 @@ class WtBtEngine:
         """
         # 更新当前交易日
         self.trading_day = date
+        # 交易日切换，合约的有效性可能发生变化，清空合约信息缓存
+        self.__contract_cache__ = dict()
+        self.__all_codes__ = None
         return
 
     def on_session_end(self, date:int):
@@ -13,6 +13,7 @@
 5. WtNpOrdDetails：逐笔委托数据容器类
 6. WtNpOrdQueues：委托队列数据容器类
 7. WtBarCache、WtTickCache：数据缓存辅助类，用于批量读取数据
+8. WtNpKlineSoA：K线数据容器类的按列存储版本，开高低收等列是连续的数组，适合整列计算
 """
 
 # 导入核心数据结构定义
@@ -25,7 +26,7 @@ import pandas as pd
 # 重复导入numpy（历史遗留，可忽略）
 import numpy as np
 # 导入ctypes模块，用于处理C结构体指针和地址
-from ctypes import POINTER, addressof
+from ctypes import POINTER, addressof, memmove
 
 # 重复导入核心数据结构（历史遗留，可忽略）
 from wtpy.WtCoreDefs import WTSBarStruct, WTSTickStruct
@@ -38,33 +39,91 @@ NpTypeBar = np.dtype([('date','u4'),('reserve','u4'),('time','u8'),('open','d'),
 
 # 定义Tick数据的NumPy数据类型
 # 字段包括：交易所、合约代码、价格信息、买卖盘信息（10档）等
+# 10档买卖价量和WTSTickStruct一样是长度为10的数组字段，取出来就是(N,10)的二维视图
 NpTypeTick = np.dtype([('exchg','S16'),('code','S32'),('price','d'),('open','d'),('high','d'),('low','d'),('settle_price','d'),\
                 ('upper_limit','d'),('lower_limit','d'),('total_volume','d'),('volume','d'),('total_turnover','d'),('turn_over','d'),\
                 ('open_interest','d'),('diff_interest','d'),('trading_date','u4'),('action_date','u4'),('action_time','u4'),\
                 ('reserve','u4'),('pre_close','d'),('pre_settle','d'),('pre_interest','d'),\
-                ('bid_price_0','d'),('bid_price_1','d'),('bid_price_2','d'),('bid_price_3','d'),('bid_price_4','d'),\
-                ('bid_price_5','d'),('bid_price_6','d'),('bid_price_7','d'),('bid_price_8','d'),('bid_price_9','d'),\
-                ('ask_price_0','d'),('ask_price_1','d'),('ask_price_2','d'),('ask_price_3','d'),('ask_price_4','d'),\
-                ('ask_price_5','d'),('ask_price_6','d'),('ask_price_7','d'),('ask_price_8','d'),('ask_price_9','d'),\
-                ('bid_qty_0','d'),('bid_qty_1','d'),('bid_qty_2','d'),('bid_qty_3','d'),('bid_qty_4','d'),\
-                ('bid_qty_5','d'),('bid_qty_6','d'),('bid_qty_7','d'),('bid_qty_8','d'),('bid_qty_9','d'),\
-                ('ask_qty_0','d'),('ask_qty_1','d'),('ask_qty_2','d'),('ask_qty_3','d'),('ask_qty_4','d'),\
-                ('ask_qty_5','d'),('ask_qty_6','d'),('ask_qty_7','d'),('ask_qty_8','d'),('ask_qty_9','d')])
+                ('bid_prices','d',10),('ask_prices','d',10),('bid_qty','d',10),('ask_qty','d',10)])
+
+# 定义紧凑的Tick数据的NumPy数据类型，用于长时间在内存中保存大量Tick或者导出，由WtNpTicks.to_compact转换得到
+# 价格按最小变动价位取整，用float32保存，单笔成交量和10档挂单量用uint32保存，去掉保留字段
+# 累计成交量、成交额、持仓量这些可能超出32位精度或范围的字段仍然用float64
+# 这只是数据读进来以后的转换，C接口的WTSTickStruct仍然是float64
+NpTypeTickCompact = np.dtype([('exchg','S16'),('code','S32'),('price','f4'),('open','f4'),('high','f4'),('low','f4'),('settle_price','f4'),\
+                ('upper_limit','f4'),('lower_limit','f4'),('total_volume','d'),('volume','u4'),('total_turnover','d'),('turn_over','d'),\
+                ('open_interest','d'),('diff_interest','d'),('trading_date','u4'),('action_date','u4'),('action_time','u4'),\
+                ('pre_close','f4'),('pre_settle','f4'),('pre_interest','d'),\
+                ('bid_prices','f4',10),('ask_prices','f4',10),('bid_qty','u4',10),('ask_qty','u4',10)])
 
 # 定义逐笔成交数据的NumPy数据类型
 # 字段包括：交易所、合约代码、日期时间、成交索引、成交类型、方向、价格、数量、买卖订单号
+# 和C结构体一样按自然对齐，保证itemsize和结构体大小一致，才能直接按内存拷贝
 NpTypeTrans = np.dtype([('exchg','S16'),('code','S32'),('trading_date','u4'),('action_date','u4'),('action_time','u4'),\
-                ('index','i8'),('ttype','i4'),('side','i4'),('price','d'),('volume','u4'),('askorder', np.int64),('bidorder', np.int64)])
+                ('index','i8'),('ttype','i4'),('side','i4'),('price','d'),('volume','u4'),('askorder', np.int64),('bidorder', np.int64)], align=True)
 
 # 定义委托队列数据的NumPy数据类型
 # 字段包括：交易所、合约代码、日期时间、方向、价格、委托笔数、队列大小、各档位委托量（50档）
+# 和C结构体一样按自然对齐，保证itemsize和结构体大小一致，才能直接按内存拷贝
 NpTypeOrdQue = np.dtype([('exchg','S16'),('code','S32'),('trading_date','u4'),('action_date','u4'),('action_time','u4'),\
-                ('side','u4'),('price','d'),('order_items','u4'),('qsize', np.int64),('volumes', np.uint32, 50)])
+                ('side','u4'),('price','d'),('order_items','u4'),('qsize','u4'),('volumes', np.uint32, 50)], align=True)
 
 # 定义逐笔委托数据的NumPy数据类型
 # 字段包括：交易所、合约代码、日期时间、委托索引、价格、数量、方向、委托类型
+# 和C结构体一样按自然对齐，保证itemsize和结构体大小一致，才能直接按内存拷贝
 NpTypeOrdDtl = np.dtype([('exchg','S16'),('code','S32'),('trading_date','u4'),('action_date','u4'),('action_time','u4'),\
-                ('index','i8'),('price','d'),('volume','u4'),('side','u4'),('otype','u4')])
+                ('index','i8'),('price','d'),('volume','u4'),('side','u4'),('otype','u4')], align=True)
+
+def _tick_times(dates:np.ndarray, times:np.ndarray, block:int = 2048) -> np.ndarray:
+    """
+    计算tick的时间戳，即日期*1000000000+时间
+
+    日期和时间都是Tick结构体数组上的跨步视图，每读一个值就要读一整个缓存行，
+    整列先乘再整列相加，第二遍又要把所有结构体从内存里重新读一次。
+    这里按块计算，一块的乘法和加法做完再算下一块，加法读的数据还在缓存里。
+
+    @dates: 日期列，格式yyyymmdd
+    @times: 时间列，格式HHMMSSmmm
+    @block: 每块的条数，2048条Tick结构体大约1M，可以放进L2缓存
+    @return: uint64的时间戳数组
+    """
+    n = len(dates)
+    # 结果直接写到预先分配的uint64数组中，不产生中间的临时数组
+    out = np.empty(n, dtype=np.uint64)
+    for start in range(0, n, block):
+        end = start + block
+        o = out[start:end]
+        np.multiply(dates[start:end], np.uint64(1000000000), out=o)
+        np.add(o, times[start:end], out=o)
+    return out
+
+def _append_rows(buffer:np.ndarray, data:np.ndarray, addr:int, count:int) -> tuple:
+    """
+    把C内存中的新数据追加到已有数据的后面
+
+    已有数据是底层内存的开头部分，新数据直接写到后面的空余部分，
+    容量不够时按当前条数的2倍重新分配并拷贝已有数据，多次追加的总拷贝量是线性的。
+    这里不用先把每批数据存成列表、用到时再一次性拼接的做法：强制拷贝模式下每批数据
+    本身就必须马上拷贝出来，拼接时还要再拷贝一次，并不比直接写进底层内存省；
+    而且所有取数据的接口都要先检查一遍有没有待拼接的数据。条数已知时用reserve一次分配好即可。
+
+    @buffer: 底层内存，可以为None
+    @data: 已有数据
+    @addr: 新数据（C结构体数组）的首地址
+    @count: 新数据的条数
+    @return: (底层内存, 追加后的数据)，追加后的数据是底层内存开头部分的视图
+    """
+    size = len(data)
+    end = size + count
+    # 容量不够（或者已有数据不在底层内存上），重新分配
+    if buffer is None or end > len(buffer):
+        newbuf = np.empty(max(size*2, end), dtype=data.dtype)
+        newbuf[:size] = data
+        buffer = newbuf
+    # 结构体和dtype的内存布局一致，直接按字节从C内存拷贝到空余部分
+    itemsize = data.dtype.itemsize
+    memmove(buffer.ctypes.data + size*itemsize, addr, count*itemsize)
+    return buffer, buffer[:end]
 
 class WtNpKline:
     """
@@ -76,6 +135,10 @@ class WtNpKline:
     
     # 类属性：NumPy数据类型，用于定义K线数据的结构
     __type__:np.dtype = NpTypeBar
+
+    # 属性是固定的，用__slots__代替实例字典，实例更小，属性读写也更快
+    __slots__ = ('__data__', '__buffer__', '__isDay__', '__force_copy__', '__bartimes__', '__df__',
+                 'opens', 'highs', 'lows', 'closes', 'volumes')
     
     def __init__(self, isDay:bool = False, forceCopy:bool = False):
         """
@@ -90,6 +153,8 @@ class WtNpKline:
         """
         # K线数据数组，存储实际的K线数据
         self.__data__:np.ndarray = None
+        # 底层内存，容量可能大于数据条数，预分配或者追加数据时使用
+        self.__buffer__:np.ndarray = None
         # 是否为日线数据标志
         self.__isDay__:bool = isDay
         # 是否强制拷贝标志
@@ -98,6 +163,26 @@ class WtNpKline:
         self.__bartimes__:np.ndarray = None
         # Pandas DataFrame缓存，避免重复转换
         self.__df__:pd.DataFrame = None
+        # 开高低收和成交量的列视图，直接作为普通属性，策略里反复读取时不用每次都经过property和按字段取列
+        # 都是引用数据数组的视图（不拷贝），数据数组变化时由__update_columns__更新
+        self.opens:np.ndarray = None
+        self.highs:np.ndarray = None
+        self.lows:np.ndarray = None
+        self.closes:np.ndarray = None
+        self.volumes:np.ndarray = None
+
+    def __update_columns__(self):
+        """
+        更新列视图
+
+        数据数组变化以后调用，重新生成开盘价、最高价、最低价、收盘价、成交量的列视图。
+        """
+        data = self.__data__
+        self.opens = data["open"]
+        self.highs = data["high"]
+        self.lows = data["low"]
+        self.closes = data["close"]
+        self.volumes = data["volume"]
 
     def __len__(self):
         """
@@ -131,6 +216,21 @@ class WtNpKline:
         # 返回指定索引的K线数据
         return self.__data__[index]
 
+    def __iter__(self):
+        """
+        遍历K线数据
+        
+        直接返回NumPy数组的迭代器，for循环不用每一条都经过一次__getitem__。
+        
+        @return: K线数据的迭代器，没有数据时为空迭代器
+        """
+        # 如果数据数组为空，返回空迭代器
+        if self.__data__ is None:
+            return iter(())
+        
+        # 交给NumPy数组迭代
+        return iter(self.__data__)
+
     def set_day_flag(self, isDay:bool):
         """
         设置日线标志
@@ -158,30 +258,54 @@ class WtNpKline:
         @firstBar: C结构体指针，指向WTSBarStruct数组的第一个元素
         @count: 数据条数，要转换的K线数量
         """
-        # 创建C结构体数组类型，长度为count
-        BarList = WTSBarStruct*count
-        # 如果强制拷贝模式
-        if self.__force_copy__:
-            # 从指针地址创建数组的副本
-            c_array = BarList.from_buffer_copy(BarList.from_address(addressof(firstBar.contents)))
-        else:
-            # 从指针地址直接引用数组（不拷贝）
-            c_array = BarList.from_buffer(BarList.from_address(addressof(firstBar.contents)))
-        # 将C数组转换为NumPy数组，使用预定义的数据类型
-        npAy = np.frombuffer(c_array, dtype=self.__type__, count=count)
-
-        # 这里有点不高效，需要拼接的地方，主要是WtDtServo的场景，这里慢点没关系
+        # C结构体数组的首地址
+        addr = addressof(firstBar.contents)
         # 如果已有数据，将新数据追加到现有数据后面
+        # 追加时用memmove把C内存直接拷贝到底层内存的空余部分，容量不够才按倍数扩容，多次追加的总拷贝量是线性的
         if self.__data__ is not None:
-            # 使用concatenate拼接数组
-            self.__data__ = np.concatenate((self.__data__, npAy))
+            self.__buffer__, self.__data__ = _append_rows(self.__buffer__, self.__data__, addr, count)
             # 设置数组的可写标志，根据forceCopy参数决定
             self.__data__.flags.writeable = self.__force_copy__
+            # 数据变了，清除缓存
+            self.__bartimes__ = None
+            self.__df__ = None
+        elif self.__force_copy__:
+            # 强制拷贝模式下的第一批数据，分配好数组后用memmove从C内存直接拷贝一次
+            self.__data__ = np.empty(count, dtype=self.__type__)
+            memmove(self.__data__.ctypes.data, addr, count*self.__type__.itemsize)
+            # 设置数组为只读
+            self.__data__.flags.writeable = False
         else:
-            # 如果没有已有数据，直接使用新数组
-            self.__data__ = npAy
-            # 设置数组为只读（除非forceCopy为True）
+            # 从指针地址直接引用数组（不拷贝），再转换为NumPy数组
+            BarList = WTSBarStruct*count
+            self.__data__ = np.frombuffer(BarList.from_address(addr), dtype=self.__type__, count=count)
+            # 设置数组为只读
             self.__data__.flags.writeable = False
+        # 数据数组变了，更新列视图
+        self.__update_columns__()
+
+    def reserve(self, count:int):
+        """
+        预分配K线数据
+
+        按总条数一次分配好一整块连续内存，之后多次set_data都直接写入这块内存，
+        避免每一批都要把之前的数据整体拼接拷贝一次。
+
+        @count: 总数据条数
+        """
+        # 当前已有的数据条数
+        size = 0 if self.__data__ is None else len(self.__data__)
+        # 分配一整块连续内存，并把已有的数据拷贝过去
+        self.__buffer__ = np.empty(max(count, size), dtype=self.__type__)
+        if size > 0:
+            self.__buffer__[:size] = self.__data__
+        # 数据数组为底层内存中已经写入的部分
+        self.__data__ = self.__buffer__[:size]
+        # 清除缓存
+        self.__bartimes__ = None
+        self.__df__ = None
+        # 数据数组变了，更新列视图
+        self.__update_columns__()
 
     @property
     def ndarray(self) -> np.ndarray:
@@ -194,61 +318,6 @@ class WtNpKline:
         """
         return self.__data__
     
-    @property
-    def opens(self) -> np.ndarray:
-        """
-        获取开盘价数组属性
-        
-        返回所有K线的开盘价数组。
-        
-        @return: 开盘价数组，NumPy数组类型
-        """
-        return self.__data__["open"]
-
-    @property
-    def highs(self) -> np.ndarray:
-        """
-        获取最高价数组属性
-        
-        返回所有K线的最高价数组。
-        
-        @return: 最高价数组，NumPy数组类型
-        """
-        return self.__data__["high"]
-
-    @property
-    def lows(self) -> np.ndarray:
-        """
-        获取最低价数组属性
-        
-        返回所有K线的最低价数组。
-        
-        @return: 最低价数组，NumPy数组类型
-        """
-        return self.__data__["low"]
-
-    @property
-    def closes(self) -> np.ndarray:
-        """
-        获取收盘价数组属性
-        
-        返回所有K线的收盘价数组。
-        
-        @return: 收盘价数组，NumPy数组类型
-        """
-        return self.__data__["close"]
-
-    @property
-    def volumes(self) -> np.ndarray:
-        """
-        获取成交量数组属性
-        
-        返回所有K线的成交量数组。
-        
-        @return: 成交量数组，NumPy数组类型
-        """
-        return self.__data__["volume"]
-
     @property
     def bartimes(self) -> np.ndarray:
         """
@@ -263,11 +332,14 @@ class WtNpKline:
         if self.__bartimes__ is None:
             # 如果是日线数据
             if self.__isDay__:
-                # 直接使用日期字段
-                self.__bartimes__ = self.__data__["date"]
+                # 直接使用日期字段，拷贝成连续的数组缓存起来，pandas索引等后续使用不用每次再整理一遍
+                self.__bartimes__ = np.ascontiguousarray(self.__data__["date"])
             else:
                 # 分钟线数据：时间字段加上基准时间戳199000000000（1990-01-01 00:00:00）
-                self.__bartimes__ = self.__data__["time"] + 199000000000
+                # 结果直接写到预先分配的uint64数组中，不产生中间的临时数组
+                out = np.empty(len(self.__data__), dtype=np.uint64)
+                np.add(self.__data__["time"], np.uint64(199000000000), out=out)
+                self.__bartimes__ = out
         # 返回时间数组
         return self.__bartimes__
     
@@ -293,6 +365,28 @@ class WtNpKline:
         """
         return self.__isDay__
     
+    def __columns__(self) -> dict:
+        """
+        按列取出K线数据
+
+        @return: 列名到列视图的字典，不包括date、time、reserve
+        """
+        return {name:self.__data__[name] for name in self.__data__.dtype.names if name not in ("date", "time", "reserve")}
+
+    def to_arrow(self):
+        """
+        转换为pyarrow的RecordBatch
+
+        不经过pandas，列和to_df一致（包括最后的bartime列），可以直接交给polars、duckdb等使用。
+        需要安装pyarrow，只在调用时才导入。
+
+        @return: pyarrow.RecordBatch对象，包含K线数据
+        """
+        import pyarrow as pa
+        cols = self.__columns__()
+        cols["bartime"] = self.bartimes
+        return pa.RecordBatch.from_arrays([pa.array(col) for col in cols.values()], names=list(cols.keys()))
+
     def to_df(self) -> pd.DataFrame:
         """
         转换为Pandas DataFrame
@@ -304,15 +398,144 @@ class WtNpKline:
         """
         # 如果DataFrame缓存为空，需要转换
         if self.__df__ is None:
+            # 按列构造DataFrame，不需要的列（date、time、reserve）直接跳过，不用先转换再删除
+            # 这里不传copy=False：DataFrame会引用只读的、甚至是C底层的内存，没有写时复制的pandas版本改数据会出错
             # 创建DataFrame，使用时间数组作为索引
-            self.__df__ = pd.DataFrame(self.__data__, index=self.bartimes)
-            # 删除不需要的列（date、time、reserve）
-            self.__df__.drop(columns=["date", "time", "reserve"], inplace=True)
+            self.__df__ = pd.DataFrame(self.__columns__(), index=self.bartimes)
             # 添加bartime列，值为索引（时间）
             self.__df__["bartime"] = self.__df__.index
         # 返回DataFrame对象
         return self.__df__
-    
+
+    def sma(self, window:int) -> np.ndarray:
+        """
+        计算收盘价的简单移动平均
+
+        用累加和相减的方式计算，整个序列只需要遍历常数遍，和窗口长度无关。
+
+        @window: 窗口长度，即K线条数
+        @return: 移动平均数组，长度和K线条数一致，前window-1个值为NaN，没有数据时返回空数组
+        @raise ValueError: 窗口长度小于1时抛出异常
+        """
+        if window < 1:
+            raise ValueError("window of sma must be at least 1, got %d" % window)
+        closes = self.closes
+        if closes is None:
+            return np.empty(0)
+        n = len(closes)
+        out = np.full(n, np.nan)
+        if n < window:
+            return out
+        # csum[i]为前i个收盘价之和，csum[0]为0
+        csum = np.empty(n+1)
+        csum[0] = 0
+        np.cumsum(closes, out=csum[1:])
+        # 窗口内的和等于两个累加和相减
+        np.subtract(csum[window:], csum[:-window], out=out[window-1:])
+        out[window-1:] /= window
+        return out
+
+    def ema(self, period:int) -> np.ndarray:
+        """
+        计算收盘价的指数移动平均
+
+        平滑系数为2/(period+1)，第一个值为第一根K线的收盘价。
+        递推计算没法向量化，交给pandas的ewm在编译好的循环里完成。
+
+        @period: 周期
+        @return: 指数移动平均数组，长度和K线条数一致，没有数据时返回空数组
+        @raise ValueError: 周期小于1时抛出异常
+        """
+        if period < 1:
+            raise ValueError("period of ema must be at least 1, got %d" % period)
+        if self.closes is None:
+            return np.empty(0)
+        return pd.Series(self.closes).ewm(span=period, adjust=False).mean().to_numpy()
+
+    def resample(self, factor:int) -> np.ndarray:
+        """
+        把K线按固定条数合并成更大周期的K线
+
+        每factor根K线合并成一根，最后不足factor根的也合并成一根。
+        开盘价取第一根，最高最低价取极值，成交量、成交额和持仓变化累加，其他字段（时间、收盘价、持仓量等）取最后一根。
+        只按条数分组，不考虑交易时段，需要按交易时段对齐的话用WtDataHelper.resample_bars。
+
+        @factor: 合并的K线条数
+        @return: 合并后的K线数组，数据类型为NpTypeBar，没有数据时返回空数组
+        @raise ValueError: 合并条数小于1时抛出异常
+        """
+        if factor < 1:
+            raise ValueError("factor of resample must be at least 1, got %d" % factor)
+        data = self.__data__
+        if data is None or len(data) == 0:
+            return np.empty(0, dtype=self.__type__)
+        n = len(data)
+        # 每组第一根和最后一根K线的位置
+        starts = np.arange(0, n, factor)
+        ends = np.minimum(starts + factor, n) - 1
+        # 按最后一根K线拷贝一份，再改写需要聚合的字段
+        ret = data[ends]
+        ret["open"] = data["open"][starts]
+        ret["high"] = np.maximum.reduceat(data["high"], starts)
+        ret["low"] = np.minimum.reduceat(data["low"], starts)
+        ret["volume"] = np.add.reduceat(data["volume"], starts)
+        ret["turnover"] = np.add.reduceat(data["turnover"], starts)
+        ret["diff"] = np.add.reduceat(data["diff"], starts)
+        return ret
+
+class WtNpKlineSoA(WtNpKline):
+    """
+    按列存储的K线数据容器类
+
+    WtNpKline的列（opens、closes等）是结构化数组上的跨步视图，一条K线88字节，
+    整列计算时每读一个缓存行只用到其中一个数值。
+    这个版本在数据设置好以后把开高低收和成交量各拷贝成一个连续的数组，
+    其他字段在第一次通过column读取时才拷贝，之后的均值、求和等整列计算都是连续内存访问。
+    按行访问（下标、ndarray、get_bar）仍然使用结构化数组。
+    每次set_data都会重新拷贝这些列，数据分多批返回时最好一次读完再用。
+    """
+
+    __slots__ = ('__soa__',)
+
+    def __init__(self, isDay:bool = False, forceCopy:bool = False):
+        """
+        构造函数
+
+        @isDay: 是否是日线数据，True表示日线，False表示分钟线
+        @forceCopy: 是否强制拷贝，含义同WtNpKline
+        """
+        # 已经拷贝出来的连续的列，字段名到数组的字典
+        self.__soa__:dict = dict()
+        super().__init__(isDay=isDay, forceCopy=forceCopy)
+
+    def __update_columns__(self):
+        """
+        更新列数据
+
+        数据数组变化以后调用，丢掉之前拷贝出来的列，重新拷贝开盘价、最高价、最低价、收盘价、成交量。
+        """
+        self.__soa__ = dict()
+        self.opens = self.column("open")
+        self.highs = self.column("high")
+        self.lows = self.column("low")
+        self.closes = self.column("close")
+        self.volumes = self.column("volume")
+
+    def column(self, name:str) -> np.ndarray:
+        """
+        获取连续存储的列
+
+        @name: 字段名，如close、turnover、open_interest
+        @return: 该字段的连续数组（只读）
+        """
+        col = self.__soa__.get(name)
+        if col is None:
+            # 从结构化数组中把这一列拷贝成连续的数组
+            col = np.ascontiguousarray(self.__data__[name])
+            col.flags.writeable = False
+            self.__soa__[name] = col
+        return col
+
 class WtNpTicks:
     """
     基于NumPy数组的Tick数据容器类
@@ -323,6 +546,9 @@ class WtNpTicks:
     
     # 类属性：NumPy数据类型，用于定义Tick数据的结构
     __type__:np.dtype = NpTypeTick
+
+    # 属性是固定的，用__slots__代替实例字典，实例更小，属性读写也更快
+    __slots__ = ('__data__', '__buffer__', '__force_copy__', '__times__', '__df__')
     
     def __init__(self, forceCopy:bool = False):
         """
@@ -336,6 +562,8 @@ class WtNpTicks:
         """
         # Tick数据数组，存储实际的Tick数据
         self.__data__:np.ndarray = None
+        # 底层内存，容量可能大于数据条数，预分配或者追加数据时使用
+        self.__buffer__:np.ndarray = None
         # Tick时间数组缓存，避免重复计算
         self.__times__:np.ndarray = None
         # 是否强制拷贝标志
@@ -375,6 +603,21 @@ class WtNpTicks:
         # 返回指定索引的Tick数据
         return self.__data__[index]
 
+    def __iter__(self):
+        """
+        遍历Tick数据
+        
+        直接返回NumPy数组的迭代器，for循环不用每一条都经过一次__getitem__。
+        
+        @return: Tick数据的迭代器，没有数据时为空迭代器
+        """
+        # 如果数据数组为空，返回空迭代器
+        if self.__data__ is None:
+            return iter(())
+        
+        # 交给NumPy数组迭代
+        return iter(self.__data__)
+
     def set_data(self, firstTick, count:int):
         """
         设置Tick数据
@@ -385,32 +628,51 @@ class WtNpTicks:
         @firstTick: C结构体指针，指向WTSTickStruct数组的第一个元素
         @count: 数据条数，要转换的Tick数量
         """
-        # 创建C结构体数组类型，长度为count
-        BarList = WTSTickStruct*count
-        # 如果强制拷贝模式
-        if self.__force_copy__:
-            # 从指针地址创建数组的副本
-            c_array = BarList.from_buffer_copy(BarList.from_address(addressof(firstTick.contents)))
-        else:
-            # 从指针地址直接引用数组（不拷贝）
-            c_array = BarList.from_buffer(BarList.from_address(addressof(firstTick.contents)))
-
-        # 将C数组转换为NumPy数组，使用预定义的数据类型
-        npAy = np.frombuffer(c_array, dtype=self.__type__, count=count)
-        # 这里有点不高效，需要拼接的地方主要是WtDtServo的场景，这里慢点没关系
-        # 一旦触发拼接逻辑，都会拷贝一次
+        # C结构体数组的首地址
+        addr = addressof(firstTick.contents)
         # 如果已有数据，将新数据追加到现有数据后面
+        # 追加时用memmove把C内存直接拷贝到底层内存的空余部分，容量不够才按倍数扩容，多次追加的总拷贝量是线性的
         if self.__data__ is not None:
-            # 使用concatenate拼接数组
-            self.__data__ = np.concatenate((self.__data__, npAy))
+            self.__buffer__, self.__data__ = _append_rows(self.__buffer__, self.__data__, addr, count)
             # 设置数组的可写标志，根据forceCopy参数决定
             self.__data__.flags.writeable = self.__force_copy__
+            # 数据变了，清除缓存
+            self.__times__ = None
+            self.__df__ = None
+        elif self.__force_copy__:
+            # 强制拷贝模式下的第一批数据，分配好数组后用memmove从C内存直接拷贝一次
+            self.__data__ = np.empty(count, dtype=self.__type__)
+            memmove(self.__data__.ctypes.data, addr, count*self.__type__.itemsize)
+            # 设置数组为只读
+            self.__data__.flags.writeable = False
         else:
-            # 如果没有已有数据，直接使用新数组
-            self.__data__ = npAy
-            # 设置数组为只读（除非forceCopy为True）
+            # 从指针地址直接引用数组（不拷贝），再转换为NumPy数组
+            BarList = WTSTickStruct*count
+            self.__data__ = np.frombuffer(BarList.from_address(addr), dtype=self.__type__, count=count)
+            # 设置数组为只读
             self.__data__.flags.writeable = False
 
+    def reserve(self, count:int):
+        """
+        预分配Tick数据
+
+        按总条数一次分配好一整块连续内存，之后多次set_data都直接写入这块内存，
+        避免每一批都要把之前的数据整体拼接拷贝一次。
+
+        @count: 总数据条数
+        """
+        # 当前已有的数据条数
+        size = 0 if self.__data__ is None else len(self.__data__)
+        # 分配一整块连续内存，并把已有的数据拷贝过去
+        self.__buffer__ = np.empty(max(count, size), dtype=self.__type__)
+        if size > 0:
+            self.__buffer__[:size] = self.__data__
+        # 数据数组为底层内存中已经写入的部分
+        self.__data__ = self.__buffer__[:size]
+        # 清除缓存
+        self.__times__ = None
+        self.__df__ = None
+
     @property
     def times(self) -> np.ndarray:
         """
@@ -424,10 +686,137 @@ class WtNpTicks:
         # 如果时间缓存为空，需要计算时间数组
         if self.__times__ is None:
             # 计算时间戳：日期（yyyymmdd）* 1000000000 + 时间（HHMMSSmmm）
-            self.__times__ = np.uint64(self.__data__["action_date"])*1000000000 + self.__data__["action_time"]
+            self.__times__ = _tick_times(self.__data__["action_date"], self.__data__["action_time"])
         # 返回时间数组
         return self.__times__
 
+    @property
+    def bid_prices(self) -> np.ndarray:
+        """
+        获取10档买价数组属性
+        
+        返回所有Tick的10档买价，是直接引用数据的二维视图，不拷贝。
+        
+        @return: 10档买价数组，形状为(N,10)
+        """
+        return self.__data__["bid_prices"]
+
+    @property
+    def ask_prices(self) -> np.ndarray:
+        """
+        获取10档卖价数组属性
+        
+        返回所有Tick的10档卖价，是直接引用数据的二维视图，不拷贝。
+        
+        @return: 10档卖价数组，形状为(N,10)
+        """
+        return self.__data__["ask_prices"]
+
+    @property
+    def bid_qty(self) -> np.ndarray:
+        """
+        获取10档买量数组属性
+        
+        返回所有Tick的10档买量，是直接引用数据的二维视图，不拷贝。
+        
+        @return: 10档买量数组，形状为(N,10)
+        """
+        return self.__data__["bid_qty"]
+
+    @property
+    def ask_qty(self) -> np.ndarray:
+        """
+        获取10档卖量数组属性
+        
+        返回所有Tick的10档卖量，是直接引用数据的二维视图，不拷贝。
+        
+        @return: 10档卖量数组，形状为(N,10)
+        """
+        return self.__data__["ask_qty"]
+
+    def total_bid_volumes(self) -> np.ndarray:
+        """
+        计算每个Tick的10档买量之和
+
+        @return: 买量合计数组，长度和Tick条数一致
+        """
+        # 每个Tick的10档买量在内存中是连续的，按行求和
+        return self.__data__["bid_qty"].sum(axis=1)
+
+    def total_ask_volumes(self) -> np.ndarray:
+        """
+        计算每个Tick的10档卖量之和
+
+        @return: 卖量合计数组，长度和Tick条数一致
+        """
+        # 每个Tick的10档卖量在内存中是连续的，按行求和
+        return self.__data__["ask_qty"].sum(axis=1)
+
+    def best_bid(self) -> np.ndarray:
+        """
+        获取每个Tick的买一价
+
+        @return: 买一价数组，是直接引用数据的视图，不拷贝
+        """
+        return self.__data__["bid_prices"][:, 0]
+
+    def best_ask(self) -> np.ndarray:
+        """
+        获取每个Tick的卖一价
+
+        @return: 卖一价数组，是直接引用数据的视图，不拷贝
+        """
+        return self.__data__["ask_prices"][:, 0]
+
+    def __columns__(self) -> dict:
+        """
+        按列取出Tick数据
+
+        10档买卖价量是二维的数组字段，按bid_price_0这样的别名拆成单独的列。
+
+        @return: 列名到列视图的字典，不包括reserve
+        """
+        cols = dict()
+        for name in WTSTickStruct._DICT_NAMES:
+            # 不需要的列（reserve）
+            if name == "reserve":
+                continue
+            if name in WTSTickStruct._ARRAY_ALIASES:
+                aname, i = WTSTickStruct._ARRAY_ALIASES[name]
+                cols[name] = self.__data__[aname][:, i]
+            else:
+                cols[name] = self.__data__[name]
+        return cols
+
+    def to_arrow(self):
+        """
+        转换为pyarrow的RecordBatch
+
+        不经过pandas，列和to_df一致（包括最后的time列），可以直接交给polars、duckdb等使用。
+        需要安装pyarrow，只在调用时才导入。
+
+        @return: pyarrow.RecordBatch对象，包含Tick数据
+        """
+        import pyarrow as pa
+        cols = self.__columns__()
+        cols["time"] = self.times
+        return pa.RecordBatch.from_arrays([pa.array(col) for col in cols.values()], names=list(cols.keys()))
+
+    def to_compact(self) -> np.ndarray:
+        """
+        转换为紧凑格式的Tick数组
+
+        价格转成float32，单笔成交量和挂单量转成uint32，每条数据的大小从512字节降到308字节，
+        适合长时间在内存中保存大量Tick或者导出。
+        价格保存的精度约为7位有效数字，成交量和挂单量的小数部分会被截掉，不适合数量有小数的品种。
+
+        @return: 紧凑格式的Tick数组，数据类型为NpTypeTickCompact
+        """
+        ret = np.empty(len(self.__data__), dtype=NpTypeTickCompact)
+        # 按字段整列转换
+        for name in NpTypeTickCompact.names:
+            ret[name] = self.__data__[name]
+        return ret
 
     def to_df(self) -> pd.DataFrame:
         """
@@ -441,9 +830,7 @@ class WtNpTicks:
         # 如果DataFrame缓存为空，需要转换
         if self.__df__ is None:
             # 创建DataFrame，使用时间数组作为索引
-            self.__df__ = pd.DataFrame(self.__data__, index=self.times)
-            # 删除不需要的列（reserve）
-            self.__df__.drop(columns=["reserve"], inplace=True)
+            self.__df__ = pd.DataFrame(self.__columns__(), index=self.times)
             # 添加time列，值为索引（时间）
             self.__df__["time"] = self.__df__.index
         # 返回DataFrame对象
@@ -470,6 +857,9 @@ class WtNpTransactions:
     
     # 类属性：NumPy数据类型，用于定义逐笔成交数据的结构
     __type__:np.dtype = NpTypeTrans
+
+    # 属性是固定的，用__slots__代替实例字典，实例更小，属性读写也更快
+    __slots__ = ('__data__', '__buffer__', '__force_copy__')
     
     def __init__(self, forceCopy:bool = False):
         """
@@ -483,6 +873,8 @@ class WtNpTransactions:
         """
         # 逐笔成交数据数组，存储实际的逐笔成交数据
         self.__data__:np.ndarray = None
+        # 底层内存，容量可能大于数据条数，预分配或者追加数据时使用
+        self.__buffer__:np.ndarray = None
         # 是否强制拷贝标志
         self.__force_copy__:bool = forceCopy
 
@@ -518,6 +910,21 @@ class WtNpTransactions:
         # 返回指定索引的逐笔成交数据
         return self.__data__[index]
 
+    def __iter__(self):
+        """
+        遍历逐笔成交数据
+        
+        直接返回NumPy数组的迭代器，for循环不用每一条都经过一次__getitem__。
+        
+        @return: 逐笔成交数据的迭代器，没有数据时为空迭代器
+        """
+        # 如果数据数组为空，返回空迭代器
+        if self.__data__ is None:
+            return iter(())
+        
+        # 交给NumPy数组迭代
+        return iter(self.__data__)
+
     def set_data(self, firstItem, count:int):
         """
         设置逐笔成交数据
@@ -528,30 +935,25 @@ class WtNpTransactions:
         @firstItem: C结构体指针，指向WTSTransStruct数组的第一个元素
         @count: 数据条数，要转换的逐笔成交数量
         """
-        # 创建C结构体数组类型，长度为count
-        DataList = WTSTransStruct*count
-        # 如果强制拷贝模式
-        if self.__force_copy__:
-            # 从指针地址创建数组的副本
-            c_array = DataList.from_buffer_copy(DataList.from_address(addressof(firstItem.contents)))
-        else:
-            # 从指针地址直接引用数组（不拷贝）
-            c_array = DataList.from_buffer(DataList.from_address(addressof(firstItem.contents)))
-        
-        # 将C数组转换为NumPy数组，使用预定义的数据类型
-        npAy = np.frombuffer(c_array, dtype=self.__type__, count=count)
-        # 这里有点不高效，需要拼接的地方主要是WtDtServo的场景，这里慢点没关系
-        # 一旦触发拼接逻辑，都会拷贝一次
+        # C结构体数组的首地址
+        addr = addressof(firstItem.contents)
         # 如果已有数据，将新数据追加到现有数据后面
+        # 追加时用memmove把C内存直接拷贝到底层内存的空余部分，容量不够才按倍数扩容，多次追加的总拷贝量是线性的
         if self.__data__ is not None:
-            # 使用concatenate拼接数组
-            self.__data__ = np.concatenate((self.__data__, npAy))
+            self.__buffer__, self.__data__ = _append_rows(self.__buffer__, self.__data__, addr, count)
             # 设置数组的可写标志，根据forceCopy参数决定
             self.__data__.flags.writeable = self.__force_copy__
+        elif self.__force_copy__:
+            # 强制拷贝模式下的第一批数据，分配好数组后用memmove从C内存直接拷贝一次
+            self.__data__ = np.empty(count, dtype=self.__type__)
+            memmove(self.__data__.ctypes.data, addr, count*self.__type__.itemsize)
+            # 设置数组为只读
+            self.__data__.flags.writeable = False
         else:
-            # 如果没有已有数据，直接使用新数组
-            self.__data__ = npAy
-            # 设置数组为只读（除非forceCopy为True）
+            # 从指针地址直接引用数组（不拷贝），再转换为NumPy数组
+            DataList = WTSTransStruct*count
+            self.__data__ = np.frombuffer(DataList.from_address(addr), dtype=self.__type__, count=count)
+            # 设置数组为只读
             self.__data__.flags.writeable = False
 
     @property
@@ -575,6 +977,9 @@ class WtNpOrdDetails:
     
     # 类属性：NumPy数据类型，用于定义逐笔委托数据的结构
     __type__:np.dtype = NpTypeOrdDtl
+
+    # 属性是固定的，用__slots__代替实例字典，实例更小，属性读写也更快
+    __slots__ = ('__data__', '__buffer__', '__force_copy__')
     
     def __init__(self, forceCopy:bool = False):
         """
@@ -588,6 +993,8 @@ class WtNpOrdDetails:
         """
         # 逐笔委托数据数组，存储实际的逐笔委托数据
         self.__data__:np.ndarray = None
+        # 底层内存，容量可能大于数据条数，预分配或者追加数据时使用
+        self.__buffer__:np.ndarray = None
         # 是否强制拷贝标志
         self.__force_copy__:bool = forceCopy
 
@@ -623,6 +1030,21 @@ class WtNpOrdDetails:
         # 返回指定索引的逐笔委托数据
         return self.__data__[index]
 
+    def __iter__(self):
+        """
+        遍历逐笔委托数据
+        
+        直接返回NumPy数组的迭代器，for循环不用每一条都经过一次__getitem__。
+        
+        @return: 逐笔委托数据的迭代器，没有数据时为空迭代器
+        """
+        # 如果数据数组为空，返回空迭代器
+        if self.__data__ is None:
+            return iter(())
+        
+        # 交给NumPy数组迭代
+        return iter(self.__data__)
+
     def set_data(self, firstItem, count:int):
         """
         设置逐笔委托数据
@@ -633,30 +1055,25 @@ class WtNpOrdDetails:
         @firstItem: C结构体指针，指向WTSOrdDtlStruct数组的第一个元素
         @count: 数据条数，要转换的逐笔委托数量
         """
-        # 创建C结构体数组类型，长度为count
-        DataList = WTSOrdDtlStruct*count
-        # 如果强制拷贝模式
-        if self.__force_copy__:
-            # 从指针地址创建数组的副本
-            c_array = DataList.from_buffer_copy(DataList.from_address(addressof(firstItem.contents)))
-        else:
-            # 从指针地址直接引用数组（不拷贝）
-            c_array = DataList.from_buffer(DataList.from_address(addressof(firstItem.contents)))
-
-        # 将C数组转换为NumPy数组，使用预定义的数据类型
-        npAy = np.frombuffer(c_array, dtype=self.__type__, count=count)
-        # 这里有点不高效，需要拼接的地方主要是WtDtServo的场景，这里慢点没关系
-        # 一旦触发拼接逻辑，都会拷贝一次
+        # C结构体数组的首地址
+        addr = addressof(firstItem.contents)
         # 如果已有数据，将新数据追加到现有数据后面
+        # 追加时用memmove把C内存直接拷贝到底层内存的空余部分，容量不够才按倍数扩容，多次追加的总拷贝量是线性的
         if self.__data__ is not None:
-            # 使用concatenate拼接数组
-            self.__data__ = np.concatenate((self.__data__, npAy))
+            self.__buffer__, self.__data__ = _append_rows(self.__buffer__, self.__data__, addr, count)
             # 设置数组的可写标志，根据forceCopy参数决定
             self.__data__.flags.writeable = self.__force_copy__
+        elif self.__force_copy__:
+            # 强制拷贝模式下的第一批数据，分配好数组后用memmove从C内存直接拷贝一次
+            self.__data__ = np.empty(count, dtype=self.__type__)
+            memmove(self.__data__.ctypes.data, addr, count*self.__type__.itemsize)
+            # 设置数组为只读
+            self.__data__.flags.writeable = False
         else:
-            # 如果没有已有数据，直接使用新数组
-            self.__data__ = npAy
-            # 设置数组为只读（除非forceCopy为True）
+            # 从指针地址直接引用数组（不拷贝），再转换为NumPy数组
+            DataList = WTSOrdDtlStruct*count
+            self.__data__ = np.frombuffer(DataList.from_address(addr), dtype=self.__type__, count=count)
+            # 设置数组为只读
             self.__data__.flags.writeable = False
 
     @property
@@ -680,6 +1097,9 @@ class WtNpOrdQueues:
     
     # 类属性：NumPy数据类型，用于定义委托队列数据的结构
     __type__:np.dtype = NpTypeOrdQue
+
+    # 属性是固定的，用__slots__代替实例字典，实例更小，属性读写也更快
+    __slots__ = ('__data__', '__buffer__', '__force_copy__')
     
     def __init__(self, forceCopy:bool = False):
         """
@@ -693,6 +1113,8 @@ class WtNpOrdQueues:
         """
         # 委托队列数据数组，存储实际的委托队列数据
         self.__data__:np.ndarray = None
+        # 底层内存，容量可能大于数据条数，预分配或者追加数据时使用
+        self.__buffer__:np.ndarray = None
         # 是否强制拷贝标志
         self.__force_copy__:bool = forceCopy
 
@@ -728,6 +1150,21 @@ class WtNpOrdQueues:
         # 返回指定索引的委托队列数据
         return self.__data__[index]
 
+    def __iter__(self):
+        """
+        遍历委托队列数据
+        
+        直接返回NumPy数组的迭代器，for循环不用每一条都经过一次__getitem__。
+        
+        @return: 委托队列数据的迭代器，没有数据时为空迭代器
+        """
+        # 如果数据数组为空，返回空迭代器
+        if self.__data__ is None:
+            return iter(())
+        
+        # 交给NumPy数组迭代
+        return iter(self.__data__)
+
     def set_data(self, firstItem, count:int):
         """
         设置委托队列数据
@@ -738,30 +1175,25 @@ class WtNpOrdQueues:
         @firstItem: C结构体指针，指向WTSOrdQueStruct数组的第一个元素
         @count: 数据条数，要转换的委托队列数量
         """
-        # 创建C结构体数组类型，长度为count
-        DataList = WTSOrdQueStruct*count
-        # 如果强制拷贝模式
-        if self.__force_copy__:
-            # 从指针地址创建数组的副本
-            c_array = DataList.from_buffer_copy(DataList.from_address(addressof(firstItem.contents)))
-        else:
-            # 从指针地址直接引用数组（不拷贝）
-            c_array = DataList.from_buffer(DataList.from_address(addressof(firstItem.contents)))
-
-        # 将C数组转换为NumPy数组，使用预定义的数据类型
-        npAy = np.frombuffer(c_array, dtype=self.__type__, count=count)
-        # 这里有点不高效，需要拼接的地方主要是WtDtServo的场景，这里慢点没关系
-        # 一旦触发拼接逻辑，都会拷贝一次
+        # C结构体数组的首地址
+        addr = addressof(firstItem.contents)
         # 如果已有数据，将新数据追加到现有数据后面
+        # 追加时用memmove把C内存直接拷贝到底层内存的空余部分，容量不够才按倍数扩容，多次追加的总拷贝量是线性的
         if self.__data__ is not None:
-            # 使用concatenate拼接数组
-            self.__data__ = np.concatenate((self.__data__, npAy))
+            self.__buffer__, self.__data__ = _append_rows(self.__buffer__, self.__data__, addr, count)
             # 设置数组的可写标志，根据forceCopy参数决定
             self.__data__.flags.writeable = self.__force_copy__
+        elif self.__force_copy__:
+            # 强制拷贝模式下的第一批数据，分配好数组后用memmove从C内存直接拷贝一次
+            self.__data__ = np.empty(count, dtype=self.__type__)
+            memmove(self.__data__.ctypes.data, addr, count*self.__type__.itemsize)
+            # 设置数组为只读
+            self.__data__.flags.writeable = False
         else:
-            # 如果没有已有数据，直接使用新数组
-            self.__data__ = npAy
-            # 设置数组为只读（除非forceCopy为True）
+            # 从指针地址直接引用数组（不拷贝），再转换为NumPy数组
+            DataList = WTSOrdQueStruct*count
+            self.__data__ = np.frombuffer(DataList.from_address(addr), dtype=self.__type__, count=count)
+            # 设置数组为只读
             self.__data__.flags.writeable = False
 
     @property
@@ -800,6 +1232,8 @@ class WtBarCache:
         self.__force_copy__ = forceCopy
         # 总数据条数计数器
         self.__total_count__ = 0
+        # 已经读取的数据条数
+        self.__read_count__ = 0
 
     def on_read_bar(self, firstItem:POINTER(WTSBarStruct), count:int, isLast:bool):
         """
@@ -815,17 +1249,20 @@ class WtBarCache:
         if self.records is None:
             self.records = WtNpKline(isDay=self.__is_day__, forceCopy=self.__force_copy__)
 
-        # 多次set_data，会在内部自动concatenate（拼接）
-        # 将本次数据添加到记录对象中
+        # 数据分多批返回时，第一批之前按总条数预分配一整块内存，之后每批set_data直接拷贝到对应位置
+        # 一次就返回了全部数据（或者没有收到总条数）时不预分配，set_data直接引用或者拷贝这一批数据
+        if self.__read_count__ == 0 and count < self.__total_count__:
+            self.records.reserve(self.__total_count__)
         self.records.set_data(firstItem, count)
+        # 累加已经读取的数据条数
+        self.__read_count__ += count
 
     def on_data_count(self, count:int):
         """
         数据总数回调函数（由底层调用）
         
         在开始读取数据前调用，通知总数据条数。
-        其实这里最好的处理方式是能够直接将底层的内存块拷贝，拼接成一块大的内存块
-        但是暂时没想好怎么处理，所以只能多次set_data了，会损失一些性能，但是比以前快
+        数据分多批返回时，会按这个总条数预分配一整块连续内存，每一批直接拷贝进去，不再反复拼接。
         
         @count: 总数据条数
         """
@@ -855,6 +1292,8 @@ class WtTickCache:
         self.__force_copy__ = forceCopy
         # 总数据条数计数器
         self.__total_count__ = 0
+        # 已经读取的数据条数
+        self.__read_count__ = 0
 
     def on_read_tick(self, firstItem:POINTER(WTSTickStruct), count:int, isLast:bool):
         """
@@ -870,17 +1309,20 @@ class WtTickCache:
         if self.records is None:
             self.records = WtNpTicks(forceCopy=self.__force_copy__)
 
-        # 多次set_data，会在内部自动concatenate（拼接）
-        # 将本次数据添加到记录对象中
+        # 数据分多批返回时，第一批之前按总条数预分配一整块内存，之后每批set_data直接拷贝到对应位置
+        # 一次就返回了全部数据（或者没有收到总条数）时不预分配，set_data直接引用或者拷贝这一批数据
+        if self.__read_count__ == 0 and count < self.__total_count__:
+            self.records.reserve(self.__total_count__)
         self.records.set_data(firstItem, count)
+        # 累加已经读取的数据条数
+        self.__read_count__ += count
 
     def on_data_count(self, count:int):
         """
         数据总数回调函数（由底层调用）
         
         在开始读取数据前调用，通知总数据条数。
-        其实这里最好的处理方式是能够直接将底层的内存块拷贝，拼接成一块大的内存块
-        但是暂时没想好怎么处理，所以只能多次set_data了，会损失一些性能，但是比以前快
+        数据分多批返回时，会按这个总条数预分配一整块连续内存，每一批直接拷贝进去，不再反复拼接。
         
         @count: 总数据条数
         """
@@ -9,17 +9,26 @@
 1. 引擎初始化：配置数据引擎的运行参数和日志配置
 2. 扩展Parser管理：添加和管理扩展的行情解析器
 3. 扩展Dumper管理：添加和管理扩展的数据导出器
-4. 数据推送：将扩展Parser接收的行情数据推送到底层
+4. 数据推送：将扩展Parser接收的行情数据推送到底层，支持逐笔、整批和按列推送
+5. 异步批量推送：WtTickBatcher把行情线程上的逐笔推送攒成批，由后台线程整批推送到底层
 """
 
+import sys
+import threading
+from ctypes import addressof, memmove
+
+import numpy as np
+
 # 导入数据引擎的底层包装器
 from wtpy.wrapper import WtDtWrapper
 # 导入扩展模块基类
 from wtpy.ExtModuleDefs import BaseExtParser, BaseExtDataDumper
-# 导入单例装饰器
-from wtpy.WtUtilDefs import singleton
-# 导入JSON处理模块
-import json
+# 导入Tick数据的C结构体
+from wtpy.WtCoreDefs import WTSTickStruct
+# 导入Tick数据的NumPy数据类型，与C接口的WTSTickStruct内存布局一致
+from wtpy.WtDataDefs import NpTypeTick
+# 导入单例装饰器和JSON转换函数
+from wtpy.WtUtilDefs import singleton, to_json_bytes
 
 @singleton
 class WtDtEngine:
@@ -30,6 +39,8 @@ class WtDtEngine:
     采用单例模式确保整个应用中只有一个引擎实例。
     """
 
+    __slots__ = ('__wrapper__', '__ext_parsers__', '__ext_dumpers__', '__dumper_registered__', '__push_quote__')
+
     def __init__(self):
         """
         构造函数
@@ -38,10 +49,14 @@ class WtDtEngine:
         """
         # 底层API接口转换器，用于调用C++底层接口
         self.__wrapper__ = WtDtWrapper(self)
+        # 推送Tick数据的底层方法，逐笔推送是热点路径，预先绑定好省掉每次的属性查找
+        self.__push_quote__ = self.__wrapper__.push_quote_from_exetended_parser
         # 存储扩展行情解析器的字典，键为解析器ID，值为BaseExtParser对象
         self.__ext_parsers__ = dict()
         # 存储扩展数据导出器的字典，键为导出器ID，值为BaseExtDataDumper对象
         self.__ext_dumpers__ = dict()
+        # 导出器回调是否已经注册到底层，回调是全局的，注册一次即可
+        self.__dumper_registered__ = False
 
     def initialize(self, cfgfile:str = "dtcfg.yaml", logprofile:str = "logcfgdt.yaml", bCfgFile:bool = True, bLogCfgFile:bool = True):
         """
@@ -66,8 +81,8 @@ class WtDtEngine:
         @cfgfile: 配置字典对象
         @logprofile: 日志配置字典对象
         """
-        # 将配置字典转换为JSON字符串，并调用底层接口初始化
-        self.__wrapper__.initialize(json.dumps(cfgfile), json.dumps(logprofile), False, False)
+        # 将配置字典转换为UTF-8编码的JSON字节串，并调用底层接口初始化
+        self.__wrapper__.initialize(to_json_bytes(cfgfile), to_json_bytes(logprofile), False, False)
     
     def run(self, bAsync:bool = False):
         """
@@ -89,15 +104,17 @@ class WtDtEngine:
         
         @parser: 扩展行情解析器对象，必须继承自BaseExtParser
         """
-        # 获取解析器ID
-        id = parser.id()
-        # 如果解析器尚未注册
-        if id not in self.__ext_parsers__:
-            # 先添加到字典中
-            self.__ext_parsers__[id] = parser
-            # 尝试在底层创建解析器，如果失败则从字典中移除
-            if not self.__wrapper__.create_extended_parser(id):
-                self.__ext_parsers__.pop(id)
+        # 获取解析器ID，驻留后底层回调传回的同名ID查字典时可以直接按指针比较
+        pid = sys.intern(parser.id())
+        parsers = self.__ext_parsers__
+        # 如果解析器已经注册，直接返回
+        if pid in parsers:
+            return
+        # 先添加到字典中
+        parsers[pid] = parser
+        # 尝试在底层创建解析器，如果失败则从字典中移除
+        if not self.__wrapper__.create_extended_parser(pid):
+            del parsers[pid]
 
     def get_extended_parser(self, id:str)->BaseExtParser:
         """
@@ -106,11 +123,8 @@ class WtDtEngine:
         @id: 解析器ID
         @return: 返回对应的BaseExtParser对象，如果不存在则返回None
         """
-        # 检查解析器是否存在
-        if id not in self.__ext_parsers__:
-            return None
-        # 返回解析器对象
-        return self.__ext_parsers__[id]
+        # 一次查找，不存在时返回None
+        return self.__ext_parsers__.get(id)
 
     def push_quote_from_extended_parser(self, id:str, newTick, uProcFlag:int):
         """
@@ -119,11 +133,72 @@ class WtDtEngine:
         当扩展解析器接收到新的Tick数据时，调用此方法将数据推送到底层引擎。
         
         @id: 解析器ID，标识数据来源
-        @newTick: Tick数据指针，类型为POINTER(WTSTickStruct)
+        @newTick: Tick数据指针，类型为POINTER(WTSTickStruct)，也可以直接传入复用的WTSTickStruct对象
+        @uProcFlag: 预处理标记，0-不处理，1-切片处理，2-累加处理
+        """
+        # 调用预先绑定的底层包装器方法推送Tick数据
+        self.__push_quote__(id, newTick, uProcFlag)
+
+    def push_quotes_from_extended_parser(self, id:str, ticks, count:int, uProcFlag:int):
+        """
+        从扩展解析器批量推送Tick数据到底层
+        
+        扩展解析器一次收到多条Tick数据时，调用此方法整批推送，比逐条调用push_quote_from_extended_parser开销小。
+        
+        @id: 解析器ID，标识数据来源
+        @ticks: Tick数据，可以是WTSTickStruct数组、指向第一条数据的指针，或者首地址（int）
+        @count: Tick数据条数
+        @uProcFlag: 预处理标记，0-不处理，1-切片处理，2-累加处理
+        """
+        # 调用底层包装器批量推送Tick数据
+        self.__wrapper__.push_quotes_from_exetended_parser(id, ticks, count, uProcFlag)
+
+    def push_quotes_from_columns(self, parserId:str, count:int, uProcFlag:int, **columns):
+        """
+        从扩展解析器按列推送Tick数据到底层
+        
+        行情源按列组织数据时（每个字段一个数组）使用，不用逐条填充WTSTickStruct。
+        各列整体拷贝到一块按WTSTickStruct布局的连续内存里，再整批推送。
+        
+        @parserId: 解析器ID，标识数据来源
+        @count: Tick数据条数
+        @uProcFlag: 预处理标记，0-不处理，1-切片处理，2-累加处理
+        @columns: 按字段名传入的各列数据，字段名同WTSTickStruct，如price=..., action_time=...，
+                  每列都必须有count行，bid_prices等10档字段传入(count,10)的数组，没有传入的字段为0
+        @raise ValueError: 字段名不存在或者某一列的行数不等于count时抛出异常
+        """
+        # 先检查字段名和行数，不要等到numpy赋值时才报出看不懂的错误
+        unknown = [name for name in columns if name not in NpTypeTick.names]
+        if unknown:
+            raise ValueError("unknown tick columns: %s" % ", ".join(unknown))
+        for name, values in columns.items():
+            rows = len(values) if np.ndim(values) > 0 else None
+            if rows != count:
+                raise ValueError("column %s has %s rows, expected %d" % (name, "no" if rows is None else rows, count))
+
+        ticks = np.zeros(count, dtype=NpTypeTick)
+        for name, values in columns.items():
+            ticks[name] = values
+        # 调用底层包装器批量推送Tick数据，ticks在推送完成前一直被引用，内存有效
+        self.__wrapper__.push_quotes_from_exetended_parser(parserId, ticks.ctypes.data, count, uProcFlag)
+
+    def create_tick_batcher(self, parserId:str, uProcFlag:int = 1, capacity:int = 8192, maxBatch:int = 4096, maxDelayMs:float = 1):
+        """
+        创建扩展解析器的异步批量推送器
+        
+        行情线程调用推送器的push只是把Tick拷贝进环形缓冲区，由推送器的后台线程按批推送到底层，
+        行情线程不再等待每一笔的底层调用。推送器创建后即启动，不再使用时调用stop。
+        
+        @parserId: 解析器ID，标识数据来源
         @uProcFlag: 预处理标记，0-不处理，1-切片处理，2-累加处理
+        @capacity: 环形缓冲区能容纳的Tick条数，满了以后push会等待后台线程腾出空间
+        @maxBatch: 积攒到多少条时立即唤醒后台线程推送
+        @maxDelayMs: 后台线程最长等待时间，单位毫秒，不满一批的数据最多延迟这么久推送
+        @return: WtTickBatcher对象
         """
-        # 调用底层包装器推送Tick数据
-        self.__wrapper__.push_quote_from_exetended_parser(id, newTick, uProcFlag)
+        batcher = WtTickBatcher(self.__wrapper__, parserId, uProcFlag, capacity, maxBatch, maxDelayMs)
+        batcher.start()
+        return batcher
 
     def add_extended_data_dumper(self, dumper:BaseExtDataDumper):
         """
@@ -134,17 +209,20 @@ class WtDtEngine:
         
         @dumper: 扩展数据导出器对象，必须继承自BaseExtDataDumper
         """
-        # 获取导出器ID
-        id = dumper.id()
+        # 获取导出器ID，驻留后底层回调传回的同名ID查字典时可以直接按指针比较
+        did = sys.intern(dumper.id())
+        dumpers = self.__ext_dumpers__
         # 如果导出器尚未注册
-        if id not in self.__ext_dumpers__:
+        if did not in dumpers:
             # 先添加到字典中
-            self.__ext_dumpers__[id] = dumper
+            dumpers[did] = dumper
             # 尝试在底层创建导出器，如果失败则从字典中移除
-            if not self.__wrapper__.create_extended_dumper(id):
-                self.__ext_dumpers__.pop(id)
-        # 注册扩展数据导出器到底层
-        self.__wrapper__.register_extended_data_dumper()
+            if not self.__wrapper__.create_extended_dumper(did):
+                del dumpers[did]
+        # 注册扩展数据导出器的回调到底层，回调按ID分发到各个导出器，只需要注册一次
+        if not self.__dumper_registered__:
+            self.__wrapper__.register_extended_data_dumper()
+            self.__dumper_registered__ = True
     
     def get_extended_data_dumper(self, id:str) -> BaseExtDataDumper:
         """
@@ -153,8 +231,180 @@ class WtDtEngine:
         @id: 导出器ID
         @return: 返回对应的BaseExtDataDumper对象，如果不存在则返回None
         """
-        # 检查导出器是否存在
-        if id not in self.__ext_dumpers__:
-            return None
-        # 返回导出器对象
-        return self.__ext_dumpers__[id]
+        # 一次查找，不存在时返回None
+        return self.__ext_dumpers__.get(id)
+
+class WtTickBatcher:
+    """
+    扩展解析器的异步批量推送器
+    
+    单生产者单消费者的环形缓冲区：行情线程（生产者）调用push写入，后台线程（消费者）整批推送到底层。
+    写位置只由生产者修改，读位置只由消费者修改，所以不需要加锁。
+    由WtDtEngine.create_tick_batcher创建，一个推送器只能由一个线程调用push。
+    """
+
+    __slots__ = ('__wrapper__', '__id__', '__flag__', '__buffer__', '__addr__', '__capacity__', '__max_batch__',
+                 '__delay__', '__head__', '__tail__', '__event__', '__space__', '__worker__', '__stopped__',
+                 '__dropped__', '__error__')
+
+    def __init__(self, wrapper, parserId:str, uProcFlag:int, capacity:int, maxBatch:int, maxDelayMs:float):
+        """
+        构造函数
+        
+        @wrapper: 数据引擎的底层包装器
+        @parserId: 解析器ID
+        @uProcFlag: 预处理标记，0-不处理，1-切片处理，2-累加处理
+        @capacity: 环形缓冲区能容纳的Tick条数
+        @maxBatch: 积攒到多少条时立即唤醒后台线程推送
+        @maxDelayMs: 后台线程最长等待时间，单位毫秒
+        """
+        self.__wrapper__ = wrapper
+        self.__id__ = parserId
+        self.__flag__ = uProcFlag
+        # 环形缓冲区，按WTSTickStruct布局，可以直接交给底层
+        self.__buffer__ = np.zeros(capacity, dtype=NpTypeTick)
+        self.__addr__ = self.__buffer__.ctypes.data
+        self.__capacity__ = capacity
+        self.__max_batch__ = min(maxBatch, capacity)
+        self.__delay__ = maxDelayMs/1000.0
+        # 累计写入和累计推送的条数，对容量取模得到在缓冲区中的位置
+        self.__head__ = 0
+        self.__tail__ = 0
+        # 唤醒后台线程的事件
+        self.__event__ = threading.Event()
+        # 后台线程推送完一批、腾出空间以后通知生产者的事件
+        self.__space__ = threading.Event()
+        self.__worker__ = None
+        self.__stopped__ = False
+        # 推送失败而丢弃的Tick累计条数，只由后台线程修改
+        self.__dropped__ = 0
+        # 后台线程最近一次推送失败的异常，下一次push时抛给调用方
+        self.__error__ = None
+
+    def start(self):
+        """
+        启动后台推送线程
+        """
+        if self.__worker__ is not None:
+            return
+        self.__stopped__ = False
+        self.__worker__ = threading.Thread(target=self.__drain_loop__, name="TickBatcher", daemon=True)
+        self.__worker__.start()
+
+    def stop(self):
+        """
+        停止后台推送线程
+        
+        缓冲区中剩余的数据会在线程退出前全部推送。
+        """
+        if self.__worker__ is None:
+            return
+        self.__stopped__ = True
+        self.__event__.set()
+        self.__worker__.join()
+        self.__worker__ = None
+
+    def push(self, newTick):
+        """
+        写入一条Tick数据
+        
+        只是拷贝到环形缓冲区，由后台线程推送到底层；缓冲区满时等待后台线程腾出空间。
+        抛出异常时这条Tick没有写入。
+        
+        @newTick: Tick数据，WTSTickStruct对象或者POINTER(WTSTickStruct)
+        @raise Exception: 推送器没有启动、已经停止或者后台线程已经退出时抛出异常，不会一直等待；
+                          后台线程上一次推送失败时，把失败原因抛出一次，丢弃的条数见dropped
+        """
+        # 没有启动或者已经停止，写进去的数据不会再被推送
+        if self.__stopped__ or self.__worker__ is None:
+            raise Exception("WtTickBatcher of %s is not running" % self.__id__)
+        # 后台线程推送失败过，通知调用方
+        error = self.__error__
+        if error is not None:
+            self.__error__ = None
+            raise Exception("WtTickBatcher of %s dropped ticks, %d in total" % (self.__id__, self.__dropped__)) from error
+
+        head = self.__head__
+        # 缓冲区满了，等后台线程推送
+        while head - self.__tail__ >= self.__capacity__:
+            # 后台线程不在运行，不会再有空间腾出来
+            worker = self.__worker__
+            if self.__stopped__ or worker is None or not worker.is_alive():
+                raise Exception("WtTickBatcher of %s is not running" % self.__id__)
+            # 先清除再检查，避免错过后台线程的通知；每次最多等一个推送周期，然后重新检查后台线程状态
+            self.__space__.clear()
+            if head - self.__tail__ < self.__capacity__:
+                break
+            self.__event__.set()
+            self.__space__.wait(self.__delay__)
+
+        if isinstance(newTick, WTSTickStruct):
+            src = addressof(newTick)
+        else:
+            src = addressof(newTick.contents)
+        size = self.__buffer__.itemsize
+        memmove(self.__addr__ + (head % self.__capacity__)*size, src, size)
+        # 数据拷贝完成以后再移动写位置，后台线程只会读到完整的数据
+        self.__head__ = head + 1
+
+        # 攒够一批，立即唤醒后台线程
+        if head + 1 - self.__tail__ >= self.__max_batch__:
+            self.__event__.set()
+
+    def pending(self) -> int:
+        """
+        缓冲区中还没有推送的条数
+        """
+        return self.__head__ - self.__tail__
+
+    def dropped(self) -> int:
+        """
+        因为底层推送失败而丢弃的累计条数
+        """
+        return self.__dropped__
+
+    def __drain_loop__(self):
+        """
+        后台线程的主循环，等待唤醒或者超时后把缓冲区中的数据全部推送
+        """
+        event = self.__event__
+        while not self.__stopped__:
+            event.wait(self.__delay__)
+            event.clear()
+            self.__drain__()
+        # 退出前把剩余数据推送完
+        self.__drain__()
+
+    def __drain__(self):
+        """
+        把读位置到写位置之间的数据整批推送到底层
+        
+        跨过缓冲区末尾时分两段推送。推送出错时这一批没有推送成功的数据会被丢弃并计入dropped，
+        不会反复重试把缓冲区堵死，异常保存下来由下一次push抛给调用方，后台线程继续运行。
+        """
+        tail = self.__tail__
+        head = self.__head__
+        if head == tail:
+            return
+
+        capacity = self.__capacity__
+        size = self.__buffer__.itemsize
+        start = tail % capacity
+        count = head - tail
+        # 已经推送成功的条数
+        sent = 0
+        try:
+            # 第一段：从读位置到缓冲区末尾
+            first = min(count, capacity - start)
+            self.__wrapper__.push_quotes_from_exetended_parser(self.__id__, self.__addr__ + start*size, first, self.__flag__)
+            sent = first
+            # 第二段：从缓冲区开头绕回来的部分
+            if count > first:
+                self.__wrapper__.push_quotes_from_exetended_parser(self.__id__, self.__addr__, count - first, self.__flag__)
+        except Exception as e:
+            self.__dropped__ += count - sent
+            self.__error__ = e
+        finally:
+            # 推送完成以后再移动读位置，生产者才能覆盖这部分数据，然后通知等待空间的生产者
+            self.__tail__ = head
+            self.__space__.set()
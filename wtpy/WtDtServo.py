@@ -9,19 +9,37 @@
 1. 配置管理：设置基础文件路径、数据存储路径等
 2. K线数据查询：支持分钟线、日线、秒线等多种周期的K线数据查询
 3. Tick数据查询：支持按时间范围或按日期查询Tick数据
-4. 缓存管理：提供缓存清除功能，提高查询性能
+4. 缓存管理：提供缓存清除功能，提高查询性能；按日期查询的结果在Python层做LRU缓存
 """
 
 # 导入数据定义模块中的K线和Tick数据结构
 from wtpy.WtDataDefs import WtNpKline, WtNpTicks
-# 导入单例装饰器
-from wtpy.WtUtilDefs import singleton
+# 导入单例装饰器和JSON转换函数
+from wtpy.WtUtilDefs import singleton, to_json_bytes
 # 导入数据服务端API包装器
 from wtpy.wrapper import WtDtServoApi
-# 导入JSON处理模块
-import json
 # 导入操作系统接口模块
 import os
+# 导入线程锁，用于保护配置的一次性提交
+import threading
+# 导入有序字典，用于实现按日期查询结果的LRU缓存
+from collections import OrderedDict
+
+def _join_files(folder:str, files) -> str:
+    """
+    拼接基础文件路径
+    
+    @folder: 基础文件目录
+    @files: 文件名，str表示单个文件，list或tuple表示多个文件
+    @return: 拼接后的路径，多个文件用逗号分隔，不支持的类型返回None
+    """
+    if isinstance(files, str):
+        # 单个文件路径，直接拼接
+        return os.path.join(folder, files)
+    if isinstance(files, (list, tuple)):
+        # 多个文件路径，拼接后用逗号分隔
+        return ','.join([os.path.join(folder, filename) for filename in files])
+    return None
 
 @singleton
 class WtDtServo:
@@ -32,23 +50,42 @@ class WtDtServo:
     采用单例模式确保整个应用中只有一个服务端实例。
     """
 
+    __slots__ = ('__config__', '__cfg_commited__', 'local_api', 'logCfg', '__query_cache__', '__cache_size__', '__commit_lock__', '__debug_json__', 
+                 '__inflight__', '__inflight_lock__', '__cache_lock__')
+
     # 构造函数, 传入动态库名
-    def __init__(self, logcfg:str="logcfg.yaml"):
+    def __init__(self, logcfg:str="logcfg.yaml", cacheSize:int = 1024, debugJson:bool = False):
         """
         构造函数
         
         初始化数据服务端，设置日志配置和内部状态。
         
         @logcfg: 日志配置文件路径，默认为logcfg.yaml
+        @cacheSize: 按日期查询结果的LRU缓存条数上限，默认为1024，为0则不缓存
+        @debugJson: 提交给底层的配置是否按键排序并缩进，便于调试时查看，默认为False，输出紧凑格式
         """
         # 配置字典，存储所有配置项
         self.__config__ = None
         # 配置是否已提交标志，防止重复提交
         self.__cfg_commited__ = False
+        # 配置提交锁，防止多个线程同时首次查询时重复初始化底层
+        self.__commit_lock__ = threading.Lock()
         # 本地API对象，用于调用底层接口
         self.local_api = None
         # 日志配置文件路径
         self.logCfg = logcfg
+        # 配置JSON是否输出为便于阅读的格式
+        self.__debug_json__ = debugJson
+        # 按日期查询结果的LRU缓存，键为(查询类型, 合约代码, 周期, 日期)，值为查询结果
+        self.__query_cache__ = OrderedDict()
+        # LRU缓存条数上限
+        self.__cache_size__ = cacheSize
+        # 保护LRU缓存的锁，查询可能来自多个线程
+        self.__cache_lock__ = threading.Lock()
+        # 正在进行中的查询，键为查询参数，值为[完成事件, 查询结果, 查询异常]
+        self.__inflight__ = dict()
+        # 保护进行中查询字典的锁
+        self.__inflight_lock__ = threading.Lock()
 
     def __check_config__(self):
         """
@@ -86,43 +123,35 @@ class WtDtServo:
         支持单个文件路径或文件路径列表。
         
         @folder: 基础文件目录，默认为./common/
-        @commfile: 品种文件路径或路径列表，支持str或list类型
-        @contractfile: 合约文件路径或路径列表，支持str或list类型
+        @commfile: 品种文件路径或路径列表，支持str、list或tuple类型
+        @contractfile: 合约文件路径或路径列表，支持str、list或tuple类型
         @holidayfile: 节假日文件路径
         @sessionfile: 交易时间模板文件路径
         @hotfile: 主力合约配置文件路径
         """
         # 检查并初始化配置
         self.__check_config__()
+        # 路径拼接函数
+        join = os.path.join
+        # 基础文件配置项
+        basefiles = self.__config__["basefiles"]
 
         # 处理品种文件路径
-        if type(commfile) == str:
-            # 单个文件路径，直接拼接
-            self.__config__["basefiles"]["commodity"] = os.path.join(folder, commfile)
-        elif type(commfile) == list:
-            # 多个文件路径，拼接后用逗号分隔
-            absList = []
-            for filename in commfile:
-                absList.append(os.path.join(folder, filename))
-            self.__config__["basefiles"]["commodity"] = ','.join(absList)
+        commodity = _join_files(folder, commfile)
+        if commodity is not None:
+            basefiles["commodity"] = commodity
 
         # 处理合约文件路径
-        if type(contractfile) == str:
-            # 单个文件路径，直接拼接
-            self.__config__["basefiles"]["contract"] = os.path.join(folder, contractfile)
-        elif type(contractfile) == list:
-            # 多个文件路径，拼接后用逗号分隔
-            absList = []
-            for filename in contractfile:
-                absList.append(os.path.join(folder, filename))
-            self.__config__["basefiles"]["contract"] = ','.join(absList)
-
-        # 设置节假日文件路径
-        self.__config__["basefiles"]["holiday"] = os.path.join(folder, holidayfile)
-        # 设置交易时间模板文件路径
-        self.__config__["basefiles"]["session"] = os.path.join(folder, sessionfile)
-        # 设置主力合约配置文件路径
-        self.__config__["basefiles"]["hot"] = os.path.join(folder, hotfile)
+        contract = _join_files(folder, contractfile)
+        if contract is not None:
+            basefiles["contract"] = contract
+
+        # 一次设置节假日文件、交易时间模板文件和主力合约配置文件路径
+        basefiles.update({
+            "holiday": join(folder, holidayfile),
+            "session": join(folder, sessionfile),
+            "hot": join(folder, hotfile)
+        })
 
     def setStorage(self, path:str = "./storage/", adjfactor:str = "adjfactors.json"):
         """
@@ -145,20 +174,25 @@ class WtDtServo:
         将配置字典转换为JSON字符串并提交到底层API进行初始化。
         只有第一次调用会生效，防止重复初始化。
         """
-        # 如果配置已提交，直接返回
+        # 如果配置已提交，直接返回，提交以后的调用不用加锁
         if self.__cfg_commited__:
             return
 
-        # 将配置字典转换为格式化的JSON字符串
-        cfgfile = json.dumps(self.__config__, indent=4, sort_keys=True)
-        try:
-            # 调用底层API初始化，传入配置JSON字符串、非文件标志和日志配置
-            self.local_api.initialize(cfgfile, False, self.logCfg)
-            # 标记配置已提交
-            self.__cfg_commited__ = True
-        except OSError as oe:
-            # 如果初始化失败，打印错误信息
-            print(oe)
+        with self.__commit_lock__:
+            # 拿到锁以后再检查一次，可能别的线程已经提交过了
+            if self.__cfg_commited__:
+                return
+
+            # 将配置字典转换为JSON字节串，直接传给底层，只有调试时才排序缩进
+            cfgfile = to_json_bytes(self.__config__, pretty=self.__debug_json__)
+            try:
+                # 调用底层API初始化，传入配置JSON字符串、非文件标志和日志配置
+                self.local_api.initialize(cfgfile, False, self.logCfg)
+                # 标记配置已提交
+                self.__cfg_commited__ = True
+            except OSError as oe:
+                # 如果初始化失败，打印错误信息
+                print(oe)
 
     def clear_cache(self):
         """
@@ -167,9 +201,84 @@ class WtDtServo:
         清除数据服务端的缓存，释放内存。
         在数据更新后调用此方法可以确保查询到最新数据。
         """        
+        # 先清掉Python层的按日期查询缓存
+        with self.__cache_lock__:
+            self.__query_cache__.clear()
         # 调用底层API清除缓存
         self.local_api.clear_cache()
 
+    def __cached_query__(self, key:tuple, loader):
+        """
+        带LRU缓存的查询
+        
+        历史某一天的数据不会再变化，按日期查询的结果可以直接复用。
+        命中时直接返回缓存的对象，未命中时调用loader查询，非空结果放入缓存，超过上限时淘汰最久未使用的一条。
+        缓存的读写都在锁内，底层查询在锁外进行。
+        
+        @key: 缓存键，(查询类型, 合约代码, 周期, 日期)
+        @loader: 未命中时调用的查询函数，参数forceCopy表示结果是否要拷贝一份，不能引用底层内存
+        @return: 查询结果，多次命中返回的是同一个只读对象
+        """
+        cache = self.__query_cache__
+        enabled = self.__cache_size__ > 0
+        if enabled:
+            with self.__cache_lock__:
+                ret = cache.get(key)
+                if ret is not None:
+                    # 命中，移到队尾表示最近使用过
+                    cache.move_to_end(key)
+                    return ret
+
+        # 要缓存的结果会一直保留，必须拷贝一份，不能引用底层随时可能释放的内存
+        ret = loader(enabled)
+        # 空结果不缓存，数据落地以后再查可以查到
+        if ret is not None and enabled:
+            # 缓存的对象会共享给多个调用方，设为只读
+            ret.ndarray.flags.writeable = False
+            with self.__cache_lock__:
+                cache[key] = ret
+                cache.move_to_end(key)
+                if len(cache) > self.__cache_size__:
+                    # 淘汰队首，即最久未使用的一条
+                    cache.popitem(last=False)
+        return ret
+
+    def __coalesced_query__(self, key:tuple, loader):
+        """
+        合并同时进行的相同查询
+        
+        多个线程同时发起参数完全相同的查询时（如多个策略启动时预热同一个合约），只有第一个线程真正调用底层，
+        其他线程等待它完成后直接拿到同一个结果。查询完成后即从进行中的查询里移除，不做缓存。
+        
+        @key: 查询参数
+        @loader: 真正执行查询的函数
+        @return: 查询结果，合并的查询返回的是同一个只读对象
+        """
+        with self.__inflight_lock__:
+            entry = self.__inflight__.get(key)
+            owner = entry is None
+            if owner:
+                entry = [threading.Event(), None, None]
+                self.__inflight__[key] = entry
+
+        if not owner:
+            # 已经有相同的查询在进行中，等它完成
+            entry[0].wait()
+            if entry[2] is not None:
+                raise entry[2]
+            return entry[1]
+
+        try:
+            entry[1] = loader()
+        except Exception as e:
+            entry[2] = e
+            raise
+        finally:
+            with self.__inflight_lock__:
+                self.__inflight__.pop(key, None)
+            entry[0].set()
+        return entry[1]
+
     def get_bars(self, stdCode:str, period:str, fromTime:int = None, dataCount:int = None, endTime:int = 0) -> WtNpKline:
         """
         获取K线数据
@@ -189,11 +298,12 @@ class WtDtServo:
         self.commitConfig()
 
         # 检查参数：fromTime和dataCount必须且只能指定其中一个
-        if (fromTime is None and dataCount is None) or (fromTime is not None and dataCount is not None):
+        if (fromTime is None) == (dataCount is None):
             raise Exception('Only one of fromTime and dataCount must be valid at the same time')
 
-        # 调用底层API获取K线数据
-        return self.local_api.get_bars(stdCode=stdCode, period=period, fromTime=fromTime, dataCount=dataCount, endTime=endTime)
+        # 调用底层API获取K线数据，同时进行的相同查询只调用一次底层
+        return self.__coalesced_query__(("bar", stdCode, period, fromTime, dataCount, endTime), 
+                lambda: self.local_api.get_bars(stdCode=stdCode, period=period, fromTime=fromTime, dataCount=dataCount, endTime=endTime))
 
     def get_ticks(self, stdCode:str, fromTime:int = None, dataCount:int = None, endTime:int = 0) -> WtNpTicks:
         """
@@ -213,11 +323,12 @@ class WtDtServo:
         self.commitConfig()
 
         # 检查参数：fromTime和dataCount必须且只能指定其中一个
-        if (fromTime is None and dataCount is None) or (fromTime is not None and dataCount is not None):
+        if (fromTime is None) == (dataCount is None):
             raise Exception('Only one of fromTime and dataCount must be valid at the same time')
 
-        # 调用底层API获取Tick数据
-        return self.local_api.get_ticks(stdCode=stdCode, fromTime=fromTime, dataCount=dataCount, endTime=endTime)
+        # 调用底层API获取Tick数据，同时进行的相同查询只调用一次底层
+        return self.__coalesced_query__(("tick", stdCode, fromTime, dataCount, endTime), 
+                lambda: self.local_api.get_ticks(stdCode=stdCode, fromTime=fromTime, dataCount=dataCount, endTime=endTime))
 
     def get_ticks_by_date(self, stdCode:str, iDate:int) -> WtNpTicks:
         """
@@ -232,8 +343,9 @@ class WtDtServo:
         # 确保配置已提交
         self.commitConfig()
 
-        # 调用底层API按日期获取Tick数据
-        return self.local_api.get_ticks_by_date(stdCode=stdCode, iDate=iDate)
+        # 调用底层API按日期获取Tick数据，结果走LRU缓存
+        return self.__cached_query__(("tick", stdCode, None, iDate), 
+                lambda forceCopy: self.local_api.get_ticks_by_date(stdCode=stdCode, iDate=iDate, forceCopy=forceCopy))
 
     def get_sbars_by_date(self, stdCode:str, iSec:int, iDate:int) -> WtNpKline:
         """
@@ -249,8 +361,9 @@ class WtDtServo:
         # 确保配置已提交
         self.commitConfig()
 
-        # 调用底层API按日期获取秒线数据
-        return self.local_api.get_sbars_by_date(stdCode=stdCode, iSec=iSec, iDate=iDate)
+        # 调用底层API按日期获取秒线数据，结果走LRU缓存
+        return self.__cached_query__(("sbar", stdCode, iSec, iDate), 
+                lambda forceCopy: self.local_api.get_sbars_by_date(stdCode=stdCode, iSec=iSec, iDate=iDate, forceCopy=forceCopy))
 
     def get_bars_by_date(self, stdCode:str, period:str, iDate:int) -> WtNpKline:
         """
@@ -267,5 +380,6 @@ class WtDtServo:
         # 确保配置已提交
         self.commitConfig()
 
-        # 调用底层API按日期获取K线数据
-        return self.local_api.get_bars_by_date(stdCode=stdCode, period=period, iDate=iDate)
+        # 调用底层API按日期获取K线数据，结果走LRU缓存
+        return self.__cached_query__(("bar", stdCode, period, iDate), 
+                lambda forceCopy: self.local_api.get_bars_by_date(stdCode=stdCode, period=period, iDate=iDate, forceCopy=forceCopy))
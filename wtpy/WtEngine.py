@@ -30,8 +30,8 @@ from wtpy.ExtToolDefs import BaseIndexWriter, BaseDataReporter
 from wtpy.WtCoreDefs import EngineType
 # 导入扩展模块基类
 from wtpy.ExtModuleDefs import BaseExtParser, BaseExtExecuter, BaseExtDataLoader
-# 导入单例装饰器
-from wtpy.WtUtilDefs import singleton
+# 导入单例装饰器、JSON转换函数和配置文件解码函数
+from wtpy.WtUtilDefs import singleton, to_json, to_json_bytes, decode_text
 
 # 导入管理器类
 from .ProductMgr import ProductMgr, ProductInfo
@@ -42,9 +42,79 @@ from .CodeHelper import CodeHelper
 
 # 导入标准库模块
 import json  # JSON格式处理
-import yaml  # YAML格式处理
-import chardet  # 字符编码检测
 import os  # 操作系统接口
+import threading  # 后台线程，用于保存最终配置
+
+# YAML解析和输出函数，第一次用到时才导入yaml
+from wtpy.WtUtilDefs import load_yaml, dump_yaml
+
+def _as_paths(files) -> list:
+    """
+    把基础文件配置项统一为路径列表
+    
+    @files: 配置项，None、单个路径（str）或者路径列表
+    @return: 路径列表
+    """
+    if files is None:
+        return []
+    if isinstance(files, str):
+        return [files]
+    return list(files)
+
+def _read_cfg_cache(cfgfile:str, st:os.stat_result) -> dict:
+    """
+    读取配置文件的JSON缓存
+    
+    缓存文件为cfgfile + ".cache.json"，第一行记录源文件的修改时间和大小，后面是解析好的配置。
+    源文件修改过或者缓存不可用时返回None。
+    
+    @cfgfile: 配置文件路径
+    @st: 配置文件的os.stat结果
+    @return: 缓存的配置字典，缓存失效时返回None
+    """
+    try:
+        with open(cfgfile + ".cache.json", "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("mtime") != st.st_mtime_ns or header.get("size") != st.st_size:
+                return None
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def _write_cfg_cache(cfgfile:str, st:os.stat_result, config:dict):
+    """
+    写入配置文件的JSON缓存
+    
+    先写临时文件再替换，避免其他进程读到写了一半的缓存。
+    配置经过JSON往返后有变化（如非字符串的键）时不写缓存；写入失败（如目录只读）时忽略。
+    
+    @cfgfile: 配置文件路径
+    @st: 配置文件的os.stat结果
+    @config: 解析好的配置字典
+    """
+    try:
+        content = json.dumps(config, ensure_ascii=False)
+        if json.loads(content) != config:
+            return
+        cachefile = cfgfile + ".cache.json"
+        tmpfile = "%s.%d.tmp" % (cachefile, os.getpid())
+        with open(tmpfile, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"mtime":st.st_mtime_ns, "size":st.st_size}))
+            f.write("\n")
+            f.write(content)
+        os.replace(tmpfile, cachefile)
+    except (OSError, TypeError, ValueError):
+        pass
+
+def _write_config_dump(filename:str, content:str):
+    """
+    保存最终配置，供排查问题使用（在后台线程中执行）
+    
+    @filename: 文件名，config_run.yaml或config_run.json
+    @content: 已经序列化好的配置内容
+    """
+    with open(filename, 'w', encoding="utf-8") as f:
+        f.write(content)
 
 @singleton
 class WtEngine:
@@ -81,6 +151,14 @@ class WtEngine:
         self.__config__ = dict()
         # 配置是否已提交标志，防止重复提交
         self.__cfg_commited__ = False
+        # 合约代码到交易时间模板的缓存，键为合约代码，值为SessionInfo对象，交易日切换时清空
+        self.__session_by_code__ = dict()
+        # 当前交易日有效合约代码列表的缓存，键为(查询类型, 查询参数)，值为合约代码列表，交易日切换时清空
+        self.__codes_cache__ = dict()
+        # 品种、合约、交易时段管理器，init之后第一次用到时才加载，见productMgr、contractMgr、sessionMgr属性
+        self.__product_mgr__:ProductMgr = None
+        self.__contract_mgr__:ContractMgr = None
+        self.__session_mgr__:SessionMgr = None
 
         # 指标输出模块，用于输出策略计算的指标数据
         self.__writer__:BaseIndexWriter = None
@@ -97,6 +175,8 @@ class WtEngine:
 
         # 是否保存最终配置标志
         self.__dump_config__ = bDumpCfg
+        # 保存最终配置的后台线程，release时等待其结束
+        self.__dump_thread__:threading.Thread = None
         # 配置文件是否为YAML格式标志
         self.__is_cfg_yaml__ = True
 
@@ -105,6 +185,12 @@ class WtEngine:
 
         # 引擎类型，保存传入的引擎类型参数
         self.__engine_type:EngineType = eType
+        # 当前引擎类型对应的上下文映射表，get_context在回调中频繁调用，构造时选好，不再每次判断引擎类型
+        self.__active_ctxs__ = {
+            EngineType.ET_CTA: self.__cta_ctxs__,
+            EngineType.ET_HFT: self.__hft_ctxs__,
+            EngineType.ET_SEL: self.__sel_ctxs__
+        }.get(eType, dict())
         # 根据引擎类型初始化对应的底层引擎
         if eType == EngineType.ET_CTA:
             # 初始化CTA引擎
@@ -182,12 +268,12 @@ class WtEngine:
         """
         # 获取解析器ID
         id = parser.id()
-        # 如果解析器ID不存在，则创建并添加
-        if id not in self.__ext_parsers__:
-            # 调用底层接口创建扩展解析器
-            if self.__wrapper__.create_extended_parser(id):
-                # 如果创建成功，保存解析器引用
-                self.__ext_parsers__[id] = parser
+        # 已经添加过的（如重连时重复添加）直接返回
+        if id in self.__ext_parsers__:
+            return
+        # 调用底层接口创建扩展解析器，创建成功才保存解析器引用
+        if self.__wrapper__.create_extended_parser(id):
+            self.__ext_parsers__[id] = parser
 
     def add_exetended_executer(self, executer:BaseExtExecuter):
         """
@@ -199,12 +285,12 @@ class WtEngine:
         """
         # 获取执行器ID
         id = executer.id()
-        # 如果执行器ID不存在，则创建并添加
-        if id not in self.__ext_executers__:
-            # 调用底层接口创建扩展执行器
-            if self.__wrapper__.create_extended_executer(id):
-                # 如果创建成功，保存执行器引用
-                self.__ext_executers__[id] = executer
+        # 已经添加过的（如重连时重复添加）直接返回
+        if id in self.__ext_executers__:
+            return
+        # 调用底层接口创建扩展执行器，创建成功才保存执行器引用
+        if self.__wrapper__.create_extended_executer(id):
+            self.__ext_executers__[id] = executer
 
     def get_extended_parser(self, id:str)->BaseExtParser:
         """
@@ -215,11 +301,8 @@ class WtEngine:
         @id: 解析器ID
         @return: BaseExtParser实例，如果不存在则返回None
         """
-        # 如果解析器ID不存在，返回None
-        if id not in self.__ext_parsers__:
-            return None
-        # 返回对应的解析器实例
-        return self.__ext_parsers__[id]
+        # 只查找一次，不存在时返回None
+        return self.__ext_parsers__.get(id)
 
     def get_extended_executer(self, id:str)->BaseExtExecuter:
         """
@@ -230,11 +313,8 @@ class WtEngine:
         @id: 执行器ID
         @return: BaseExtExecuter实例，如果不存在则返回None
         """
-        # 如果执行器ID不存在，返回None
-        if id not in self.__ext_executers__:
-            return None
-        # 返回对应的执行器实例
-        return self.__ext_executers__[id]
+        # 只查找一次，不存在时返回None
+        return self.__ext_executers__.get(id)
 
     def push_quote_from_extended_parser(self, id:str, newTick, uProcFlag:int):
         """
@@ -309,86 +389,94 @@ class WtEngine:
         @hotfile: 主力合约配置文件路径，如果为None则使用配置文件中的路径
         @secondfile: 秒线配置文件路径，如果为None则使用配置文件中的路径
         """
-        # 以二进制模式打开配置文件
-        f = open(cfgfile, "rb")
-        # 读取文件内容
-        content = f.read()
-        # 关闭文件
-        f.close()
-        # 检测文件编码（检测前500字节）
-        encoding = chardet.detect(content[:500])["encoding"]
-        # 使用检测到的编码解码文件内容
-        content = content.decode(encoding)
-
         # 根据文件扩展名判断文件格式
-        if cfgfile.lower().endswith(".json"):
-            # 如果是JSON文件，使用json模块解析
-            self.__config__ = json.loads(content)
-            # 设置配置文件格式标志为False（非YAML）
-            self.__is_cfg_yaml__ = False
-        else:
-            # 如果是YAML文件，使用yaml模块解析
-            self.__config__ = yaml.full_load(content)
-            # 设置配置文件格式标志为True（YAML）
-            self.__is_cfg_yaml__ = True
+        self.__is_cfg_yaml__ = not cfgfile.lower().endswith(".json")
+
+        # YAML配置先尝试读取JSON缓存，配置文件没有修改过时不用再解析YAML
+        st = os.stat(cfgfile)
+        config = _read_cfg_cache(cfgfile, st) if self.__is_cfg_yaml__ else None
+        if config is None:
+            # 以二进制模式读取配置文件
+            with open(cfgfile, "rb") as f:
+                raw = f.read()
+            # 按BOM、UTF-8、GBK的顺序判断编码并解码
+            content = decode_text(raw)
+
+            if self.__is_cfg_yaml__:
+                # 如果是YAML文件，使用yaml模块解析，并写入JSON缓存供下次启动使用
+                config = load_yaml(content)
+                _write_cfg_cache(cfgfile, st, config)
+            else:
+                # 如果是JSON文件，使用json模块解析
+                config = json.loads(content)
+        self.__config__ = config
 
         # 检查并补充默认配置项
         self.__check_config__()
+        # 基础文件配置项，后面多次用到，只取一次
+        basefiles = self.__config__["basefiles"]
+
+        # 合约、交易时段、品种、节假日、主力合约和秒线配置文件，提供了路径的才更新配置
+        for key, fname in (("contract", contractfile), ("session", sessionfile), ("commodity", commfile),
+                           ("holiday", holidayfile), ("hot", hotfile), ("second", secondfile)):
+            if fname is not None:
+                basefiles[key] = os.path.join(folder, fname)
+
+        # 管理器第一次用到时才加载，那时往往已经在底层回调里，出错只会被打印出来，所以先在这里检查文件是否存在
+        # 品种文件不存在时按原来的逻辑忽略，合约文件和交易时段文件必须存在
+        if "session" not in basefiles:
+            raise KeyError("session file is not configured in basefiles")
+        for key in ("contract", "session"):
+            for fname in _as_paths(basefiles.get(key)):
+                if not os.path.exists(fname):
+                    raise FileNotFoundError("%s file %s not found" % (key, fname))
+
+        # 品种、合约和交易时段管理器在第一次用到时按当前配置加载，这里只丢弃之前加载的
+        self.__product_mgr__ = None
+        self.__contract_mgr__ = None
+        self.__session_mgr__ = None
+        # 清空缓存的交易时间模板和合约代码列表
+        self.__session_by_code__.clear()
+        self.__codes_cache__.clear()
+
+    @property
+    def productMgr(self) -> ProductMgr:
+        """
+        品种管理器
+        
+        第一次访问时才创建并加载品种文件，单个文件和文件列表统一按列表处理，多个文件时并行读取。
+        """
+        if self.__product_mgr__ is None:
+            productMgr = ProductMgr()
+            productMgr.load_files(_as_paths(self.__config__["basefiles"].get("commodity")))
+            self.__product_mgr__ = productMgr
+        return self.__product_mgr__
+
+    @property
+    def contractMgr(self) -> ContractMgr:
+        """
+        合约管理器
+        
+        第一次访问时才创建并加载合约文件，会先加载品种管理器。
+        """
+        if self.__contract_mgr__ is None:
+            contractMgr = ContractMgr(self.productMgr)
+            contractMgr.load_files(_as_paths(self.__config__["basefiles"].get("contract")))
+            self.__contract_mgr__ = contractMgr
+        return self.__contract_mgr__
 
-        # 如果提供了合约文件路径，则更新配置
-        if contractfile is not None:        
-            self.__config__["basefiles"]["contract"] = os.path.join(folder, contractfile)
-        
-        # 如果提供了交易时段文件路径，则更新配置
-        if sessionfile is not None:
-            self.__config__["basefiles"]["session"] = os.path.join(folder, sessionfile)
-
-        # 如果提供了品种文件路径，则更新配置
-        if commfile is not None:
-            self.__config__["basefiles"]["commodity"] = os.path.join(folder, commfile)
-
-        # 如果提供了节假日文件路径，则更新配置
-        if holidayfile is not None:
-            self.__config__["basefiles"]["holiday"] = os.path.join(folder, holidayfile)
-
-        # 如果提供了主力合约配置文件路径，则更新配置
-        if hotfile is not None:
-            self.__config__["basefiles"]["hot"] = os.path.join(folder, hotfile)
-
-        # 如果提供了秒线配置文件路径，则更新配置
-        if secondfile is not None:
-            self.__config__["basefiles"]["second"] = os.path.join(folder, secondfile)
-
-        # 创建品种管理器实例
-        self.productMgr = ProductMgr()
-        # 如果配置中包含品种文件路径
-        if "commodity" in self.__config__["basefiles"] and self.__config__["basefiles"]["commodity"] is not None:
-            # 如果品种文件路径是字符串（单个文件）
-            if type(self.__config__["basefiles"]["commodity"]) == str:
-                # 加载单个品种文件
-                self.productMgr.load(self.__config__["basefiles"]["commodity"])
-            # 如果品种文件路径是列表（多个文件）
-            elif type(self.__config__["basefiles"]["commodity"]) == list:
-                # 遍历列表，加载每个品种文件
-                for fname in self.__config__["basefiles"]["commodity"]:
-                    self.productMgr.load(fname)
-
-        # 创建合约管理器实例，传入品种管理器引用
-        self.contractMgr = ContractMgr(self.productMgr)
-        # 如果合约文件路径是字符串（单个文件）
-        if type(self.__config__["basefiles"]["contract"]) == str:
-            # 加载单个合约文件
-            self.contractMgr.load(self.__config__["basefiles"]["contract"])
-        # 如果合约文件路径是列表（多个文件）
-        elif type(self.__config__["basefiles"]["contract"]) == list:
-            # 遍历列表，加载每个合约文件
-            for fname in self.__config__["basefiles"]["contract"]:
-                self.contractMgr.load(fname)
-
-        # 创建交易时段管理器实例
-        self.sessionMgr = SessionMgr()
-        # 加载交易时段文件
-        self.sessionMgr.load(self.__config__["basefiles"]["session"])
+    @property
+    def sessionMgr(self) -> SessionMgr:
+        """
+        交易时段管理器
+        
+        第一次访问时才创建并加载交易时段文件。
+        """
+        if self.__session_mgr__ is None:
+            sessionMgr = SessionMgr()
+            sessionMgr.load(self.__config__["basefiles"]["session"])
+            self.__session_mgr__ = sessionMgr
+        return self.__session_mgr__
 
     def configEngine(self, name:str, mode:str = "product"):
         """
@@ -399,10 +487,8 @@ class WtEngine:
         @name: 引擎名称，用于标识引擎实例
         @mode: 运行模式，默认为"product"（产品模式），还可以是其他模式
         """
-        # 设置环境名称
-        self.__config__["env"]["name"] = name
-        # 设置运行模式
-        self.__config__["env"]["mode"] = mode
+        # 一次设置环境名称和运行模式
+        self.__config__["env"].update(name=name, mode=mode)
 
     def addExternalCtaStrategy(self, id:str, params:dict):
         """
@@ -413,18 +499,8 @@ class WtEngine:
         @id: 策略ID，唯一标识一个策略
         @params: 策略参数字典，包含策略的配置信息
         """
-        # 如果配置中没有"strategies"字段，添加空字典
-        if "strategies" not in self.__config__:
-            self.__config__["strategies"] = dict()
-
-        # 如果配置中没有"cta"字段，添加空列表
-        if "cta" not in self.__config__["strategies"]:
-            self.__config__["strategies"]["cta"] = list()
-
-        # 在参数字典中添加策略ID
-        params["id"] = id
-        # 将策略参数添加到CTA策略列表
-        self.__config__["strategies"]["cta"].append(params)
+        # 复制参数字典并添加策略ID，不修改调用方传入的字典，然后添加到CTA策略列表，没有对应字段时先补上
+        self.__config__.setdefault("strategies", dict()).setdefault("cta", list()).append({**params, "id": id})
 
     def addExternalHftStrategy(self, id:str, params:dict):
         """
@@ -435,18 +511,8 @@ class WtEngine:
         @id: 策略ID，唯一标识一个策略
         @params: 策略参数字典，包含策略的配置信息
         """
-        # 如果配置中没有"strategies"字段，添加空字典
-        if "strategies" not in self.__config__:
-            self.__config__["strategies"] = dict()
-
-        # 如果配置中没有"hft"字段，添加空列表
-        if "hft" not in self.__config__["strategies"]:
-            self.__config__["strategies"]["hft"] = list()
-
-        # 在参数字典中添加策略ID
-        params["id"] = id
-        # 将策略参数添加到HFT策略列表
-        self.__config__["strategies"]["hft"].append(params)
+        # 复制参数字典并添加策略ID，不修改调用方传入的字典，然后添加到HFT策略列表，没有对应字段时先补上
+        self.__config__.setdefault("strategies", dict()).setdefault("hft", list()).append({**params, "id": id})
 
     def configStorage(self, path:str, module:str=""):
         """
@@ -457,10 +523,12 @@ class WtEngine:
         @path: 数据存储路径
         @module: 存储模式，空字符串表示使用wt框架自带数据存储，"csv"表示从csv直接读取（一般回测使用），"wtp"表示使用wt框架自带数据存储
         """
+        # 取存储配置项，配置中没有data或store时先补上
+        store = self.__config__.setdefault("data", dict()).setdefault("store", dict())
         # 设置存储模块
-        self.__config__["data"]["store"]["module"] = module
+        store["module"] = module
         # 设置存储路径
-        self.__config__["data"]["store"]["path"] = path
+        store["path"] = path
 
     def registerCustomRule(self, ruleTag:str, filename:str):
         """
@@ -471,12 +539,8 @@ class WtEngine:
         @ruleTag: 规则标签，例如ruleTag为"THIS"，对应的连续合约代码为"CFFEX.IF.THIS"
         @filename: 规则定义文件名，格式和hots.json一样
         """
-        # 如果配置中没有"rules"字段，添加空字典
-        if "rules" not in self.__config__["basefiles"]:
-            self.__config__["basefiles"]["rules"] = dict()
-
-        # 将规则标签和文件名添加到配置中
-        self.__config__["basefiles"]["rules"][ruleTag] = filename
+        # 如果配置中没有"rules"字段，添加空字典，然后将规则标签和文件名添加到配置中
+        self.__config__["basefiles"].setdefault("rules", dict())[ruleTag] = filename
 
     def commitConfig(self):
         """
@@ -489,32 +553,25 @@ class WtEngine:
         if self.__cfg_commited__:
             return
 
-        # 将配置字典转换为格式化的JSON字符串
-        cfgfile = json.dumps(self.__config__, indent=4, sort_keys=True)
+        # 如果需要保存最终配置，在提交给底层之前就在当前线程序列化好，只把写盘放到后台线程
+        # 底层启动时出错正是最需要这份配置的时候，所以写盘线程不是守护线程，进程退出前一定会写完
+        if self.__dump_config__:
+            if self.__is_cfg_yaml__:
+                # 将配置字典转换为YAML格式
+                dump = ("config_run.yaml", dump_yaml(self.__config__, indent=4, allow_unicode=True))
+            else:
+                # 如果是JSON格式，保存时才生成便于阅读的格式化JSON
+                dump = ("config_run.json", to_json(self.__config__, pretty=True))
+            self.__dump_thread__ = threading.Thread(target=_write_config_dump, args=dump)
+            self.__dump_thread__.start()
+
+        # 将配置字典转换为紧凑的JSON字节串，底层解析不需要排序和缩进
+        cfgfile = to_json_bytes(self.__config__)
         # 调用底层接口提交配置（第二个参数False表示传入的是字符串而非文件路径）
         self.__wrapper__.config(cfgfile, False)
         # 标记配置已提交
         self.__cfg_commited__ = True
 
-        # 如果需要保存最终配置
-        if self.__dump_config__:
-            # 如果是YAML格式
-            if self.__is_cfg_yaml__:
-                # 打开文件准备写入
-                f = open("config_run.yaml", 'w')
-                # 将配置字典转换为YAML格式并写入文件
-                f.write(yaml.dump_all(self.__config__, indent=4, allow_unicode=True))
-                # 关闭文件
-                f.close()
-            else:
-                # 如果是JSON格式
-                # 打开文件准备写入
-                f = open("config_run.json", 'w')
-                # 写入JSON字符串
-                f.write(cfgfile)
-                # 关闭文件
-                f.close()
-
     def regCtaStraFactories(self, factFolder:str):
         """
         向底层模块注册CTA工厂模块目录
@@ -562,10 +619,6 @@ class WtEngine:
         @policies: 执行策略字典，包含执行策略的配置
         @scale: 数量放大倍数，用于调整交易数量，默认为1
         """
-        # 如果配置中没有"executers"字段，添加空列表
-        if "executers" not in self.__config__:
-            self.__config__["executers"] = list()
-
         # 创建执行器配置项
         exeItem = {
             "active":True,      # 是否激活
@@ -575,8 +628,8 @@ class WtEngine:
             "trader":trader     # 交易接口ID
         }
 
-        # 将执行器配置添加到列表
-        self.__config__["executers"].append(exeItem)
+        # 将执行器配置添加到列表，配置中没有"executers"字段时先添加空列表
+        self.__config__.setdefault("executers", list()).append(exeItem)
 
     def addTrader(self, id:str, params:dict):
         """
@@ -587,19 +640,11 @@ class WtEngine:
         @id: 交易接口ID，唯一标识一个交易接口
         @params: 交易接口参数字典，包含连接信息等配置
         """
-        # 如果配置中没有"traders"字段，添加空列表
-        if "traders" not in self.__config__:
-            self.__config__["traders"] = list()
+        # 创建交易接口配置项，复制参数字典，设置为激活状态并设置交易接口ID，不修改调用方传入的字典
+        tItem = {**params, "active": True, "id": id}
 
-        # 创建交易接口配置项
-        tItem = params
-        # 设置交易接口为激活状态
-        tItem["active"] = True
-        # 设置交易接口ID
-        tItem["id"] = id
-
-        # 将交易接口配置添加到列表
-        self.__config__["traders"].append(tItem)
+        # 将交易接口配置添加到列表，配置中没有"traders"字段时先添加空列表
+        self.__config__.setdefault("traders", list()).append(tItem)
 
     def getSessionByCode(self, stdCode:str) -> SessionInfo:
         """
@@ -610,6 +655,11 @@ class WtEngine:
         @stdCode: 合约代码，格式如SHFE.rb.HOT
         @return: SessionInfo对象，如果找不到则返回None
         """
+        # 先查缓存，策略每个tick或bar都可能调用
+        sInfo = self.__session_by_code__.get(stdCode)
+        if sInfo is not None:
+            return sInfo
+
         # 将标准代码转换为标准品种ID
         pid = CodeHelper.stdCodeToStdCommID(stdCode)
         # 获取品种信息
@@ -618,8 +668,11 @@ class WtEngine:
         if pInfo is None:
             return None
 
-        # 根据品种信息中的交易时段名称获取交易时段信息
-        return self.sessionMgr.getSession(pInfo.session)
+        # 根据品种信息中的交易时段名称获取交易时段信息，找到了才缓存
+        sInfo = self.sessionMgr.getSession(pInfo.session)
+        if sInfo is not None:
+            self.__session_by_code__[stdCode] = sInfo
+        return sInfo
 
     def getSessionByName(self, sname:str) -> SessionInfo:
         """
@@ -665,8 +718,13 @@ class WtEngine:
         
         @return: 合约代码列表
         """
-        # 调用合约管理器获取全部合约代码，传入当前交易日
-        return self.contractMgr.getTotalCodes(self.trading_day)
+        # 当前交易日第一次查询时调用合约管理器遍历全部合约，之后直接用缓存
+        key = ("all", None)
+        codes = self.__codes_cache__.get(key)
+        if codes is None:
+            codes = self.__codes_cache__[key] = self.contractMgr.getTotalCodes(self.trading_day)
+        # 返回副本，调用方修改返回的列表不会影响缓存
+        return list(codes)
     
     def getCodesByProduct(self, stdPID:str) -> list:
         """
@@ -677,8 +735,13 @@ class WtEngine:
         @stdPID: 品种代码，格式如SHFE.rb
         @return: 合约代码列表
         """
-        # 调用合约管理器根据品种代码获取合约列表，传入当前交易日
-        return self.contractMgr.getCodesByProduct(stdPID, self.trading_day)
+        # 当前交易日第一次查询该品种时调用合约管理器，之后直接用缓存
+        key = ("product", stdPID)
+        codes = self.__codes_cache__.get(key)
+        if codes is None:
+            codes = self.__codes_cache__[key] = self.contractMgr.getCodesByProduct(stdPID, self.trading_day)
+        # 返回副本，调用方修改返回的列表不会影响缓存
+        return list(codes)
     
     def getCodesByUnderlying(self, underlying:str) -> list:
         """
@@ -689,8 +752,13 @@ class WtEngine:
         @underlying: 标的资产代码，格式如CFFEX.IM2304
         @return: 合约代码列表
         """
-        # 调用合约管理器根据标的资产获取合约列表，传入当前交易日
-        return self.contractMgr.getCodesByUnderlying(underlying, self.trading_day)
+        # 当前交易日第一次查询该标的时调用合约管理器，之后直接用缓存
+        key = ("underlying", underlying)
+        codes = self.__codes_cache__.get(key)
+        if codes is None:
+            codes = self.__codes_cache__[key] = self.contractMgr.getCodesByUnderlying(underlying, self.trading_day)
+        # 返回副本，调用方修改返回的列表不会影响缓存
+        return list(codes)
 
     def getRawStdCode(self, stdCode:str):
         """
@@ -762,25 +830,8 @@ class WtEngine:
         @id: 上下文ID，一般添加策略的时候会自动生成一个唯一的上下文ID
         @return: 策略上下文对象（CtaContext、HftContext或SelContext），如果不存在则返回None
         """
-        # 根据引擎类型查找对应的上下文
-        if self.__engine_type == EngineType.ET_CTA:
-            # 如果是CTA引擎，从CTA上下文映射表中查找
-            if id not in self.__cta_ctxs__:
-                return None
-
-            return self.__cta_ctxs__[id]
-        elif self.__engine_type == EngineType.ET_HFT:
-            # 如果是HFT引擎，从HFT上下文映射表中查找
-            if id not in self.__hft_ctxs__:
-                return None
-
-            return self.__hft_ctxs__[id]
-        elif self.__engine_type == EngineType.ET_SEL:
-            # 如果是SEL引擎，从SEL上下文映射表中查找
-            if id not in self.__sel_ctxs__:
-                return None
-
-            return self.__sel_ctxs__[id]
+        # 从当前引擎类型对应的上下文映射表中查找，不存在时返回None
+        return self.__active_ctxs__.get(id)
 
     def run(self, bAsync:bool = True):
         """
@@ -805,6 +856,10 @@ class WtEngine:
         """
         # 调用底层接口释放引擎
         self.__wrapper__.release()
+        # 等待最终配置保存完成
+        if self.__dump_thread__ is not None:
+            self.__dump_thread__.join()
+            self.__dump_thread__ = None
 
     def on_init(self):
         """
@@ -843,6 +898,9 @@ class WtEngine:
         # print("session begin")
         # 更新当前交易日
         self.trading_day = date
+        # 交易日切换，清空按合约代码缓存的交易时间模板和按交易日过滤的合约代码列表
+        self.__session_by_code__.clear()
+        self.__codes_cache__.clear()
         return
 
     def on_session_end(self, date:int):
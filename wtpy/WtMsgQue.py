@@ -32,6 +32,8 @@ class WtMQServer:
         """
         # 服务器ID，由底层分配，初始化时为None
         self.id = None
+        # 编码好的主题缓存，键为主题名称，值为UTF-8编码的bytes，同一主题反复发布时不用每次编码
+        self._topics = dict()
 
     def init(self, wrapper:WtMQWrapper, id:int):
         """
@@ -61,8 +63,29 @@ class WtMQServer:
         if self.id is None:
             raise Exception("MQServer not initialzied")
 
+        # 取编码好的主题，第一次发布该主题时编码并缓存
+        tb = self._topics.get(topic)
+        if tb is None:
+            tb = self._topics[topic] = bytes(topic, 'utf-8')
         # 调用底层接口发布消息
-        self.wrapper.publish_message(self.id, topic, message)
+        self.wrapper.publish_message(self.id, tb, message)
+
+    def publish_batch(self, topic:str, messages:list):
+        """
+        批量发布消息到指定主题
+        
+        适合一次要发布很多条消息的场景，主题只编码一次，每条消息的开销比逐条调用publish_message小。
+        
+        @topic: 主题名称，字符串类型
+        @messages: 要发布的消息列表，元素为字符串或UTF-8编码的bytes
+        @raise Exception: 如果服务器未初始化则抛出异常
+        """
+        # 检查服务器是否已初始化
+        if self.id is None:
+            raise Exception("MQServer not initialzied")
+
+        # 调用底层接口批量发布消息
+        self.wrapper.publish_messages(self.id, topic, messages)
 
 class WtMQClient:
     """
@@ -158,12 +181,11 @@ class WtMsgQue:
         self._servers = dict()
         # 存储所有客户端的字典，键为客户端ID，值为WtMQClient对象
         self._clients = dict()
+        # 每个客户端各自的消息回调函数，键为客户端ID，需要一直持有引用，防止被回收
+        self._cb_msgs = dict()
         # 创建底层消息队列包装器，传入self作为回调对象
         self._wrapper = WtMQWrapper(self)
 
-        # 创建消息回调函数，当底层收到消息时会调用self.on_mq_message
-        self._cb_msg = CB_ON_MSG(self.on_mq_message)
-
     def get_client(self, client_id:int) -> WtMQClient:
         """
         根据客户端ID获取客户端对象
@@ -171,33 +193,8 @@ class WtMsgQue:
         @client_id: 客户端ID
         @return: 返回对应的WtMQClient对象，如果不存在则返回None
         """
-        # 检查客户端ID是否存在
-        if client_id not in self._clients:
-            return None
-        
-        # 返回对应的客户端对象
-        return self._clients[client_id]
-
-    def on_mq_message(self, client_id:int, topic:str, message:str, dataLen:int):
-        """
-        消息接收回调函数（由底层调用）
-        
-        当底层收到消息时，会调用此函数。此函数会找到对应的客户端对象，
-        并调用客户端的on_mq_message方法。
-        
-        @client_id: 接收消息的客户端ID
-        @topic: 消息所属的主题名称
-        @message: 消息内容
-        @dataLen: 消息数据长度
-        """
-        # 根据客户端ID获取客户端对象
-        client = self.get_client(client_id)
-        # 如果客户端不存在，直接返回
-        if client is None:
-            return
-
-        # 调用客户端的消息处理函数
-        client.on_mq_message(topic, message, dataLen)
+        # 只查找一次，不存在时返回None
+        return self._clients.get(client_id)
 
     def add_mq_server(self, url:str, server:WtMQServer = None) -> WtMQServer:
         """
@@ -251,11 +248,16 @@ class WtMsgQue:
         @client: 可选的客户端对象，如果为None则创建新对象
         @return: 返回客户端对象
         """
-        # 调用底层接口创建客户端，传入消息回调函数，返回客户端ID
-        id = self._wrapper.create_client(url, self._cb_msg)
         # 如果未提供客户端对象，则创建新对象
         if client is None:
             client = WtMQClient()
+        # 每个客户端单独创建消息回调函数，底层收到消息直接调用客户端的on_mq_message，不再按客户端ID分发
+        onMsg = client.on_mq_message
+        cbMsg = CB_ON_MSG(lambda id, topic, message, dataLen: onMsg(topic, message, dataLen))
+        # 调用底层接口创建客户端，传入消息回调函数，返回客户端ID
+        id = self._wrapper.create_client(url, cbMsg)
+        # 保存回调函数的引用
+        self._cb_msgs[id] = cbMsg
         # 初始化客户端对象
         client.init(self._wrapper, id)
         # 将客户端注册到管理器中
@@ -279,6 +281,7 @@ class WtMsgQue:
         
         # 调用底层接口销毁客户端
         self._wrapper.destroy_client(id)
-        # 从管理器中移除客户端
+        # 从管理器中移除客户端，客户端销毁以后再释放其回调函数
         self._clients.pop(id)
+        self._cb_msgs.pop(id, None)
         
@@ -7,8 +7,23 @@
 主要功能：
 1. singleton装饰器：实现单例模式，确保某个类只有一个实例
 2. deprecated装饰器：标记已废弃的函数，调用时输出警告信息
+3. to_json函数：把配置字典转换为JSON字符串，安装了orjson时使用orjson
+4. to_json_bytes函数：同to_json，但直接输出UTF-8编码的bytes，可以原样传给底层的char*参数
+5. decode_text函数：把配置文件内容解码为字符串，按BOM、UTF-8、GBK的顺序判断编码
+6. read_map_file/read_map_files函数：读取并解析品种、合约、交易时段等基础数据文件，多个文件时并行读取
+7. load_yaml/dump_yaml函数：YAML解析和输出，第一次调用时才导入yaml
 """
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson是可选的，安装了就用它转换JSON，没有安装则使用标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def singleton(cls):
     """
     单例模式装饰器
@@ -19,8 +34,8 @@ def singleton(cls):
     @cls: 要修饰的类对象
     @return: 返回一个包装函数，该函数会检查并返回类的唯一实例
     """
-    # 存储已创建的实例，键为类对象，值为类的实例
-    instances = {}
+    # 每个被修饰的类有自己的闭包，直接用闭包变量保存唯一实例，获取时不用再查字典
+    instance = None
     def getinstance(*args,**kwargs):
         """
         获取类实例的内部函数
@@ -29,11 +44,12 @@ def singleton(cls):
         @**kwargs: 关键字参数，传递给类的构造函数
         @return: 返回类的唯一实例
         """
-        # 如果该类还没有创建过实例，则创建新实例并存储
-        if cls not in instances:
-            instances[cls] = cls(*args,**kwargs)
+        nonlocal instance
+        # 如果该类还没有创建过实例，则创建新实例并保存
+        if instance is None:
+            instance = cls(*args,**kwargs)
         # 返回已存在的实例
-        return instances[cls]
+        return instance
     return getinstance
 
 
@@ -61,3 +77,142 @@ def deprecated(func):
         # 调用原函数并返回结果
         return func(*args, **kwargs)
     return wrapper
+
+def to_json(obj, pretty:bool = False) -> str:
+    """
+    把对象转换为JSON字符串
+
+    主要用于把配置字典转换为JSON字符串提交给底层。
+    安装了orjson时使用orjson，比标准库快很多；orjson不支持的对象（如超过64位的整数）仍然交给标准库处理。
+
+    @obj: 要转换的对象
+    @pretty: 是否按键排序并缩进，便于阅读，默认为False，输出紧凑格式
+    @return: JSON字符串
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+
+    if pretty:
+        return json.dumps(obj, indent=4, sort_keys=True)
+    return json.dumps(obj, separators=(",", ":"))
+
+def to_json_bytes(obj, pretty:bool = False) -> bytes:
+    """
+    把对象转换为UTF-8编码的JSON字节串
+
+    orjson本身输出的就是UTF-8字节串，直接交给底层可以省掉一次decode和一次encode。
+
+    @obj: 要转换的对象
+    @pretty: 是否按键排序并缩进，便于阅读，默认为False，输出紧凑格式
+    @return: UTF-8编码的JSON字节串
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+
+    if pretty:
+        return json.dumps(obj, indent=4, sort_keys=True).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def decode_text(raw) -> str:
+    """
+    把配置文件内容解码为字符串
+
+    配置文件只有UTF-8（可能带BOM）和GBK两种常见编码，按BOM判断，否则先按UTF-8解码，失败再按GBK（GB18030）解码。
+    不用chardet：它要对内容做统计，速度慢，而且对以ASCII为主、只有少量中文的GBK文件经常误判成cp437之类的编码。
+    通过memoryview直接从缓冲区解码，传入mmap时不会先把整个文件拷贝成bytes，跳过BOM也不会再切片拷贝。
+
+    @raw: 文件的原始内容，bytes或者mmap、memoryview等支持缓冲区协议的对象
+    @return: 解码后的字符串
+    """
+    head = bytes(raw[:3])
+    if head.startswith(b'\xef\xbb\xbf'):
+        offset, encodings = 3, ("utf-8",)
+    elif head.startswith(b'\xff\xfe') or head.startswith(b'\xfe\xff'):
+        offset, encodings = 0, ("utf-16",)
+    else:
+        offset, encodings = 0, ("utf-8", "gb18030")
+
+    # 用with及时释放视图，mmap在还有视图引用时不能关闭
+    with memoryview(raw) as mv, mv[offset:] as body:
+        for encoding in encodings[:-1]:
+            try:
+                return str(body, encoding)
+            except UnicodeDecodeError:
+                pass
+        return str(body, encodings[-1])
+
+def read_map_file(fname:str, missingOk:bool = False) -> dict:
+    """
+    读取并解析基础数据文件（品种、合约、交易时段等）
+
+    只做读取和解析，不修改任何管理器的状态，可以在多个线程中同时调用。
+
+    @fname: 文件路径，支持.json和.yaml格式
+    @missingOk: 文件不存在时是否忽略，为True时返回None，为False时抛出异常
+    @return: 解析得到的字典
+    """
+    if missingOk and not os.path.exists(fname):
+        return None
+    with open(fname, 'rb') as f:
+        content = decode_text(f.read())
+
+    # 根据文件扩展名选择解析方式
+    if fname.lower().endswith(".yaml"):
+        return load_yaml(content)
+    return json.loads(content)
+
+def read_map_files(fnames:list, missingOk:bool = False, maxWorkers:int = 8) -> list:
+    """
+    读取并解析多个基础数据文件
+
+    多个文件时用线程池并行读取和解析，结果按文件顺序返回，调用方在自己的线程中按顺序合并。
+
+    @fnames: 文件路径列表
+    @missingOk: 文件不存在时是否忽略，含义同read_map_file
+    @maxWorkers: 最多使用的线程数，默认为8
+    @return: 解析得到的字典列表，与fnames一一对应
+    """
+    if len(fnames) <= 1:
+        return [read_map_file(fname, missingOk) for fname in fnames]
+
+    with ThreadPoolExecutor(max_workers=min(maxWorkers, len(fnames))) as executor:
+        return list(executor.map(lambda fname: read_map_file(fname, missingOk), fnames))
+
+def load_yaml(content:str):
+    """
+    解析YAML文本
+
+    yaml只在读取YAML配置时才用到，第一次调用时才导入，只导入wtpy而不读YAML配置时不需要付出导入yaml的开销。
+    优先使用libyaml实现的C解析器，比纯Python实现快得多，没有编译libyaml时退回纯Python实现。
+
+    @content: YAML文本
+    @return: 解析得到的对象
+    """
+    import yaml
+    return yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def dump_yaml(obj, **kwargs) -> str:
+    """
+    把对象输出为YAML文本
+
+    同load_yaml，第一次调用时才导入yaml，优先使用libyaml实现的C输出器。
+
+    @obj: 要输出的对象
+    @kwargs: 传给yaml.dump的其他参数，如indent、allow_unicode
+    @return: YAML文本
+    """
+    import yaml
+    return yaml.dump(obj, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), **kwargs)
+
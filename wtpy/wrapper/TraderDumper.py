@@ -25,11 +25,10 @@ from ctypes import cdll,CFUNCTYPE,c_void_p,c_char_p,c_uint32,c_double,c_bool,c_u
 
 # 导入操作系统模块
 import os
-# 导入字符编码检测模块，用于自动检测配置文件编码
-import chardet
-# 导入YAML和JSON处理模块，用于解析配置文件
-import yaml
+# 导入JSON处理模块，用于解析配置文件，yaml只在读取YAML配置时才导入
 import json
+# 导入配置文件解码函数
+from wtpy.WtUtilDefs import decode_text
 
 # 定义账户信息回调函数类型：通道ID、交易日、货币、上日余额、当前余额、动态权益、平仓盈亏、浮动盈亏、手续费、保证金、入金、出金、是否最后一条
 CB_ACCOUNT = CFUNCTYPE(c_void_p, c_char_p, c_uint32, c_char_p, c_double, c_double, c_double, c_double, 
@@ -255,10 +254,8 @@ class TraderDumper:
             content = f.read()
             # 关闭文件
             f.close()
-            # 检测文件编码（只检测前500字节）
-            encoding = chardet.detect(content[:500])["encoding"]
-            # 使用检测到的编码解码文件内容
-            content = content.decode(encoding)
+            # 按BOM、UTF-8、GBK的顺序判断编码并解码
+            content = decode_text(content)
 
             # 根据文件扩展名选择解析方式
             if cfgfile.lower().endswith(".json"):
@@ -267,7 +264,8 @@ class TraderDumper:
                 # 标记配置文件不是YAML格式
                 self.__is_cfg_yaml__ = False
             else:
-                # YAML格式：使用YAML解析
+                # YAML格式：使用YAML解析，延迟导入yaml
+                import yaml
                 self.__config__ = yaml.full_load(content)
                 # 标记配置文件是YAML格式
                 self.__is_cfg_yaml__ = True
@@ -25,7 +25,7 @@
 # 导入ctypes库，用于调用C++动态库
 from ctypes import c_uint32, cdll, c_char_p, c_bool, c_ulong, c_uint64, c_double, c_int, POINTER
 # 导入策略回调函数类型定义
-from wtpy.WtCoreDefs import CB_STRATEGY_INIT, CB_STRATEGY_TICK, CB_STRATEGY_CALC, CB_STRATEGY_BAR, CB_STRATEGY_GET_BAR, CB_STRATEGY_GET_TICK, CB_STRATEGY_GET_POSITION, CB_STRATEGY_COND_TRIGGER
+from wtpy.WtCoreDefs import CB_STRATEGY_INIT, CB_STRATEGY_TICK_RAW, CB_STRATEGY_CALC, CB_STRATEGY_BAR, CB_STRATEGY_GET_BAR, CB_STRATEGY_GET_TICK, CB_STRATEGY_GET_POSITION, CB_STRATEGY_COND_TRIGGER
 # 导入HFT策略回调函数类型定义
 from wtpy.WtCoreDefs import CB_HFTSTRA_CHNL_EVT, CB_HFTSTRA_ENTRUST, CB_HFTSTRA_ORD, CB_HFTSTRA_TRD, CB_SESSION_EVENT
 # 导入HFT策略数据回调函数类型定义
@@ -344,7 +344,7 @@ class WtBtWrapper:
             ctx.on_calculate_done()
         return
 
-    def on_stra_tick(self, id:int, stdCode:str, newTick:POINTER(WTSTickStruct)):
+    def on_stra_tick(self, id:int, stdCode:str, newTick:int):
         """
         Tick数据回调函数
         
@@ -353,7 +353,7 @@ class WtBtWrapper:
         
         @param id: 策略ID，唯一标识一个策略实例
         @param stdCode: 合约代码（字节字符串，需要解码）
-        @param newTick: 新的Tick数据指针（指向WTSTickStruct结构体）
+        @param newTick: 新的Tick数据地址（CB_STRATEGY_TICK_RAW回调，收到的是int地址）
         """
         # 获取回测引擎对象引用
         engine = self._engine
@@ -362,8 +362,8 @@ class WtBtWrapper:
 
         # 如果上下文存在，将Tick数据传递给策略，触发策略的on_tick回调
         if ctx is not None:
-            # 将合约代码从字节字符串解码为Python字符串，Tick指针直接传递
-            ctx.on_tick(bytes.decode(stdCode), newTick)
+            # 将合约代码从字节字符串解码为Python字符串，Tick地址直接映射为结构体后传递
+            ctx.on_tick(bytes.decode(stdCode), WTSTickStruct.from_address(newTick))
         return
     
     def on_stra_bar(self, id:int, stdCode:str, period:str, newBar:POINTER(WTSBarStruct)):
@@ -800,11 +800,14 @@ class WtBtWrapper:
         
         加载配置文件，配置回测引擎的参数，包括数据源、策略、回测参数等。
         
-        @param cfgfile: 配置文件路径或配置内容（字符串，默认'config.yaml'）
+        @param cfgfile: 配置文件路径或配置内容（字符串，默认'config.yaml'），也可以直接传入UTF-8编码的bytes
         @param isFile: 是否为文件路径（布尔值，默认True），True表示cfgfile是文件路径，False表示cfgfile是配置内容
         """
+        # 已经是bytes的直接传给底层，不再重复编码
+        if not isinstance(cfgfile, bytes):
+            cfgfile = bytes(cfgfile, encoding = "utf8")
         # 调用C++接口函数，配置回测引擎
-        self.api.config_backtest(bytes(cfgfile, encoding = "utf8"), isFile)
+        self.api.config_backtest(cfgfile, isFile)
 
     def initialize_cta(self, logCfg:str = "logcfgbt.yaml", isFile:bool = True, outDir:str = "./outputs_bt"):
         """
@@ -821,7 +824,7 @@ class WtBtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建策略计算回调函数对象，用于接收策略计算事件
         self.cb_stra_calc = CB_STRATEGY_CALC(self.on_stra_calc)
         # 创建策略计算完成回调函数对象（回测引擎特有），用于接收策略计算完成事件
@@ -869,7 +872,7 @@ class WtBtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建K线闭合回调函数对象，用于接收K线闭合事件
         self.cb_stra_bar = CB_STRATEGY_BAR(self.on_stra_bar)
         # 创建会话事件回调函数对象，用于接收交易会话开始/结束事件
@@ -929,7 +932,7 @@ class WtBtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建策略计算回调函数对象，用于接收策略计算事件
         self.cb_stra_calc = CB_STRATEGY_CALC(self.on_stra_calc)
         # 创建策略计算完成回调函数对象（回测引擎特有），用于接收策略计算完成事件
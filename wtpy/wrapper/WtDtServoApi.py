@@ -92,12 +92,15 @@ class WtDtServoApi:
         """
         初始化数据服务
         
-        @param cfgfile: 配置文件路径或配置内容
+        @param cfgfile: 配置文件路径或配置内容，也可以直接传入UTF-8编码的bytes
         @param isFile: 是否为文件路径，True表示文件路径，False表示配置内容
         @param logcfg: 日志配置文件路径，默认为'logcfg.yaml'
         """
+        # 已经是bytes的直接传给底层，不再重复编码
+        if not isinstance(cfgfile, bytes):
+            cfgfile = bytes(cfgfile, encoding = "utf8")
         # 调用C++库初始化数据服务
-        self.api.initialize(bytes(cfgfile, encoding = "utf8"), isFile, bytes(logcfg, encoding = "utf8"))
+        self.api.initialize(cfgfile, isFile, bytes(logcfg, encoding = "utf8"))
 
     def clear_cache(self):
         """
@@ -171,7 +174,7 @@ class WtDtServoApi:
             # 返回缓存中的数据记录
             return tick_cache.records
 
-    def get_ticks_by_date(self, stdCode:str, iDate:int) -> WtNpTicks:
+    def get_ticks_by_date(self, stdCode:str, iDate:int, forceCopy:bool = False) -> WtNpTicks:
         """
         按天读取Tick数据
         
@@ -179,10 +182,11 @@ class WtDtServoApi:
         
         @param stdCode: 标准合约代码
         @param iDate: 数据日期，格式为yyyymmdd
+        @param forceCopy: 是否强制拷贝数据，结果要长期持有时应为True，默认为False
         @return WtNpTicks: Tick数据对象（NumPy数组封装），如果查询失败返回None
         """        
         # 创建Tick数据缓存对象，用于接收C++库返回的数据
-        tick_cache = WtTickCache()
+        tick_cache = WtTickCache(forceCopy=forceCopy)
         # 调用C++库的get_ticks_by_date函数查询指定日期的Tick数据
         ret = self.api.get_ticks_by_date(bytes(stdCode, encoding="utf8"), iDate, CB_GET_TICK(tick_cache.on_read_tick), CB_DATA_COUNT(tick_cache.on_data_count))   
 
@@ -193,7 +197,7 @@ class WtDtServoApi:
             # 返回缓存中的数据记录
             return tick_cache.records
 
-    def get_sbars_by_date(self, stdCode:str, iSec:int, iDate:int) -> WtNpKline:
+    def get_sbars_by_date(self, stdCode:str, iSec:int, iDate:int, forceCopy:bool = False) -> WtNpKline:
         """
         按天读取秒线数据
         
@@ -202,10 +206,11 @@ class WtDtServoApi:
         @param stdCode: 标准合约代码
         @param iSec: 周期，单位秒（s）
         @param iDate: 数据日期，格式为yyyymmdd
+        @param forceCopy: 是否强制拷贝数据，结果要长期持有时应为True，默认为False
         @return WtNpKline: K线数据对象（NumPy数组封装），如果查询失败返回None
         """        
         # 创建K线数据缓存对象，用于接收C++库返回的数据
-        bar_cache = WtBarCache()
+        bar_cache = WtBarCache(forceCopy=forceCopy)
         # 调用C++库的get_sbars_by_date函数查询指定日期的秒线数据
         ret = self.api.get_sbars_by_date(bytes(stdCode, encoding="utf8"), iSec, iDate, CB_GET_BAR(bar_cache.on_read_bar), CB_DATA_COUNT(bar_cache.on_data_count))
 
@@ -216,7 +221,7 @@ class WtDtServoApi:
             # 返回缓存中的数据记录
             return bar_cache.records
 
-    def get_bars_by_date(self, stdCode:str, period:str, iDate:int) -> WtNpKline:
+    def get_bars_by_date(self, stdCode:str, period:str, iDate:int, forceCopy:bool = False) -> WtNpKline:
         """
         按天读取分钟线数据
         
@@ -225,6 +230,7 @@ class WtDtServoApi:
         @param stdCode: 标准合约代码
         @param period: 周期，分钟线（如m1、m5等）
         @param iDate: 数据日期，格式为yyyymmdd
+        @param forceCopy: 是否强制拷贝数据，结果要长期持有时应为True，默认为False
         @return WtNpKline: K线数据对象（NumPy数组封装），如果查询失败或周期不是分钟线返回None
         """
         # 检查周期是否为分钟线（分钟线周期以'm'开头）
@@ -232,7 +238,7 @@ class WtDtServoApi:
             return None
 
         # 创建K线数据缓存对象，用于接收C++库返回的数据
-        bar_cache = WtBarCache()
+        bar_cache = WtBarCache(forceCopy=forceCopy)
         # 调用C++库的get_bars_by_date函数查询指定日期的分钟线数据
         ret = self.api.get_bars_by_date(bytes(stdCode, encoding="utf8"), bytes(period, encoding="utf8"), iDate, CB_GET_BAR(bar_cache.on_read_bar), CB_DATA_COUNT(bar_cache.on_data_count))
 
@@ -18,7 +18,7 @@
 """
 
 # 导入ctypes库，用于调用C++动态库
-from ctypes import cdll, c_char_p, c_bool, POINTER
+from ctypes import cdll, c_char_p, c_bool, c_void_p, c_uint32, POINTER, Array, addressof, sizeof, byref
 # 导入平台辅助工具，用于获取动态库路径和编码转换
 from .PlatformHelper import PlatformHelper as ph
 # 导入单例装饰器，确保全局唯一实例
@@ -54,6 +54,8 @@ class WtDtWrapper:
         """
         # 保存数据引擎引用
         self._engine = engine
+        # 已创建的解析器ID到UTF-8编码ID的映射，推送行情时直接取用，不再逐笔编码
+        self._parser_ids = dict()
         # 获取当前文件所在目录
         paths = os.path.split(__file__)
         # 获取数据组件动态库文件名（包含平台和架构信息）
@@ -79,6 +81,10 @@ class WtDtWrapper:
         # 设置create_ext_dumper函数的参数类型：导出器ID（字符串）
         self.api.create_ext_dumper.argtypes = [c_char_p]
 
+        # 设置parser_push_quote函数的参数类型：解析器ID（字符串）、Tick数据地址、处理标志
+        # Tick数据用c_void_p，指针、byref和整数地址都可以直接传入，批量推送时不用为每条Tick构造指针对象
+        self.api.parser_push_quote.argtypes = [c_char_p, c_void_p, c_uint32]
+
     def run_datakit(self, bAsync:bool = False):
         """
         启动数据组件
@@ -107,14 +113,19 @@ class WtDtWrapper:
         
         初始化数据组件，加载配置文件和日志配置。
         
-        @param cfgfile: 配置文件路径或配置内容，默认为"dtcfg.yaml"
-        @param logprofile: 日志配置文件路径或配置内容，默认为"logcfgdt.jsyamlon"
+        @param cfgfile: 配置文件路径或配置内容，默认为"dtcfg.yaml"，也可以直接传入UTF-8编码的bytes
+        @param logprofile: 日志配置文件路径或配置内容，默认为"logcfgdt.jsyamlon"，也可以直接传入UTF-8编码的bytes
         @param bCfgFile: 配置文件参数是否为文件路径，True表示文件路径，False表示配置内容，默认为True
         @param bLogCfgFile: 日志配置文件参数是否为文件路径，True表示文件路径，False表示配置内容，默认为True
         """
         try:
+            # 已经是bytes的直接传给底层，不再重复编码
+            if not isinstance(cfgfile, bytes):
+                cfgfile = bytes(cfgfile, encoding = "utf8")
+            if not isinstance(logprofile, bytes):
+                logprofile = bytes(logprofile, encoding = "utf8")
             # 调用C++库初始化数据组件
-            self.api.initialize(bytes(cfgfile, encoding = "utf8"), bytes(logprofile, encoding = "utf8"), bCfgFile, bLogCfgFile)
+            self.api.initialize(cfgfile, logprofile, bCfgFile, bLogCfgFile)
             # 注册扩展模块的回调函数
             self.register_extended_module_callbacks()
         except OSError as oe:
@@ -133,8 +144,12 @@ class WtDtWrapper:
         @param id: 解析器ID，用于标识不同的解析器实例
         @return bool: 是否创建成功
         """
-        # 调用C++库创建扩展解析器
-        return self.api.create_ext_parser(bytes(id, encoding = "utf8"))
+        bid = bytes(id, encoding = "utf8")
+        # 调用C++库创建扩展解析器，成功后缓存编码后的ID
+        if not self.api.create_ext_parser(bid):
+            return False
+        self._parser_ids[id] = bid
+        return True
 
     def push_quote_from_exetended_parser(self, id:str, newTick:POINTER(WTSTickStruct), uProcFlag:int = 1):
         """
@@ -143,12 +158,47 @@ class WtDtWrapper:
         将扩展解析器接收到的行情数据推送到数据组件进行处理和存储。
         
         @param id: 解析器ID
-        @param newTick: 新的Tick数据指针
+        @param newTick: 新的Tick数据指针，也可以直接传入WTSTickStruct对象
         @param uProcFlag: 处理标志，默认为1
         @return bool: 是否推送成功
         """
+        # 优先使用创建解析器时缓存的编码ID
+        bid = self._parser_ids.get(id)
+        if bid is None:
+            bid = bytes(id, encoding = "utf8")
+        # 结构体对象用byref传地址，比每次构造pointer对象开销小得多
+        if isinstance(newTick, WTSTickStruct):
+            newTick = byref(newTick)
         # 调用C++库推送行情数据
-        return self.api.parser_push_quote(bytes(id, encoding = "utf8"), newTick, uProcFlag)
+        return self.api.parser_push_quote(bid, newTick, uProcFlag)
+
+    def push_quotes_from_exetended_parser(self, id:str, ticks, count:int, uProcFlag:int = 1):
+        """
+        从扩展解析器批量推送行情数据
+        
+        底层只有逐条推送的接口，这里在一次调用中推送整批数据：解析器ID只编码一次，
+        底层接口只查找一次，每条Tick的地址按偏移直接计算，不再为每条Tick构造指针对象。
+        
+        @param id: 解析器ID
+        @param ticks: Tick数据，可以是WTSTickStruct数组、指向第一条数据的指针，或者首地址（int，如NumPy数组的ctypes.data）
+        @param count: Tick数据条数
+        @param uProcFlag: 处理标志，默认为1
+        """
+        # 整批数据的首地址
+        if type(ticks) == int:
+            addr = ticks
+        elif isinstance(ticks, Array):
+            addr = addressof(ticks)
+        else:
+            addr = addressof(ticks.contents)
+        push = self.api.parser_push_quote
+        bid = self._parser_ids.get(id)
+        if bid is None:
+            bid = bytes(id, encoding = "utf8")
+        size = sizeof(WTSTickStruct)
+        # 逐条调用C++库推送行情数据
+        for i in range(count):
+            push(bid, addr + i*size, uProcFlag)
 
     def register_extended_module_callbacks(self,):
         """
@@ -110,13 +110,38 @@ class WtMQWrapper:
         发布消息到指定主题
         
         @param id: 服务器ID
-        @param topic: 主题名称
-        @param message: 消息内容
-        """
-        # 将消息内容转换为UTF-8字节串
-        message = bytes(message, 'utf-8')
+        @param topic: 主题名称，也可以直接传入UTF-8编码的bytes
+        @param message: 消息内容，也可以直接传入UTF-8编码的bytes
+        """
+        # 已经是bytes的直接发送，不再重复编码
+        if not isinstance(topic, bytes):
+            topic = bytes(topic, 'utf-8')
+        if not isinstance(message, bytes):
+            message = bytes(message, 'utf-8')
         # 调用C++库发布消息：服务器ID、主题、消息内容、消息长度
-        self.api.publish_message(id, bytes(topic, 'utf-8'), message, len(message))
+        self.api.publish_message(id, topic, message, len(message))
+
+    def publish_messages(self, id:int, topic:str, messages:list):
+        """
+        批量发布消息到指定主题
+        
+        底层没有批量发布接口，这里主题只编码一次，并且在循环外取好底层函数，减少每条消息的Python开销。
+        
+        @param id: 服务器ID
+        @param topic: 主题名称，也可以直接传入UTF-8编码的bytes
+        @param messages: 消息内容列表，元素为字符串或UTF-8编码的bytes
+        """
+        # 主题只编码一次
+        if not isinstance(topic, bytes):
+            topic = bytes(topic, 'utf-8')
+        # 在循环外取好底层函数
+        publish = self.api.publish_message
+        for message in messages:
+            # 已经是bytes的直接发送，不再重复编码
+            if not isinstance(message, bytes):
+                message = bytes(message, 'utf-8')
+            # 调用C++库发布消息：服务器ID、主题、消息内容、消息长度
+            publish(id, topic, message, len(message))
 
     def create_client(self, url:str, cbMsg:CB_ON_MSG):
         """
@@ -21,7 +21,7 @@ from ctypes import c_int32, cdll, c_char_p, c_bool, c_ulong, c_uint64, c_uint32,
 # 导入执行器回调函数类型定义
 from wtpy.WtCoreDefs import CB_EXECUTER_CMD, CB_EXECUTER_INIT, CB_PARSER_EVENT, CB_PARSER_SUBCMD
 # 导入策略回调函数类型定义
-from wtpy.WtCoreDefs import CB_STRATEGY_INIT, CB_STRATEGY_TICK, CB_STRATEGY_CALC, CB_STRATEGY_BAR, CB_STRATEGY_GET_BAR, CB_STRATEGY_GET_TICK, CB_STRATEGY_GET_POSITION, CB_STRATEGY_COND_TRIGGER
+from wtpy.WtCoreDefs import CB_STRATEGY_INIT, CB_STRATEGY_TICK_RAW, CB_STRATEGY_CALC, CB_STRATEGY_BAR, CB_STRATEGY_GET_BAR, CB_STRATEGY_GET_TICK, CB_STRATEGY_GET_POSITION, CB_STRATEGY_COND_TRIGGER
 # 导入解析器事件类型定义
 from wtpy.WtCoreDefs import EVENT_PARSER_CONNECT, EVENT_PARSER_DISCONNECT, EVENT_PARSER_INIT, EVENT_PARSER_RELEASE
 # 导入HFT策略回调函数类型定义
@@ -313,7 +313,7 @@ class WtWrapper:
             ctx.on_calculate()
         return
     
-    def on_stra_tick(self, id:int, stdCode:str, newTick:POINTER(WTSTickStruct)):
+    def on_stra_tick(self, id:int, stdCode:str, newTick:int):
         """
         Tick数据回调函数
         
@@ -322,7 +322,7 @@ class WtWrapper:
         
         @param id: 策略ID，唯一标识一个策略实例
         @param stdCode: 合约代码（字节字符串，需要解码）
-        @param newTick: 新的Tick数据指针（指向WTSTickStruct结构体）
+        @param newTick: 新的Tick数据地址（CB_STRATEGY_TICK_RAW回调，收到的是int地址）
         """
         # 获取交易引擎对象引用
         engine = self._engine
@@ -331,8 +331,8 @@ class WtWrapper:
 
         # 如果上下文存在，将Tick数据传递给策略，触发策略的on_tick回调
         if ctx is not None:
-            # 将合约代码从字节字符串解码为Python字符串，Tick指针直接传递
-            ctx.on_tick(bytes.decode(stdCode), newTick)
+            # 将合约代码从字节字符串解码为Python字符串，Tick地址直接映射为结构体后传递
+            ctx.on_tick(bytes.decode(stdCode), WTSTickStruct.from_address(newTick))
         return
     
     def on_stra_bar(self, id:int, stdCode:str, period:str, newBar:POINTER(WTSBarStruct)):
@@ -1007,11 +1007,14 @@ class WtWrapper:
         
         加载配置文件，配置实盘交易引擎的参数，包括行情源、交易接口、策略等。
         
-        @param cfgfile: 配置文件路径或配置内容（字符串，默认'config.yaml'）
+        @param cfgfile: 配置文件路径或配置内容（字符串，默认'config.yaml'），也可以直接传入UTF-8编码的bytes
         @param isFile: 是否为文件路径，True表示cfgfile是文件路径，False表示cfgfile是配置内容
         """
+        # 已经是bytes的直接传给底层，不再重复编码
+        if not isinstance(cfgfile, bytes):
+            cfgfile = bytes(cfgfile, encoding = "utf8")
         # 调用C++接口函数，配置实盘交易引擎
-        self.api.config_porter(bytes(cfgfile, encoding = "utf8"), isFile)
+        self.api.config_porter(cfgfile, isFile)
 
     def get_raw_stdcode(self, stdCode:str):
         """
@@ -1122,7 +1125,7 @@ class WtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建策略计算回调函数对象，用于接收策略计算事件
         self.cb_stra_calc = CB_STRATEGY_CALC(self.on_stra_calc)
         # 创建K线闭合回调函数对象，用于接收K线闭合事件
@@ -1169,7 +1172,7 @@ class WtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建K线闭合回调函数对象，用于接收K线闭合事件
         self.cb_stra_bar = CB_STRATEGY_BAR(self.on_stra_bar)
         # 创建会话事件回调函数对象，用于接收交易会话开始/结束事件
@@ -1230,7 +1233,7 @@ class WtWrapper:
         # 创建策略初始化回调函数对象，用于接收策略初始化事件
         self.cb_stra_init = CB_STRATEGY_INIT(self.on_stra_init)
         # 创建Tick数据回调函数对象，用于接收Tick行情数据
-        self.cb_stra_tick = CB_STRATEGY_TICK(self.on_stra_tick)
+        self.cb_stra_tick = CB_STRATEGY_TICK_RAW(self.on_stra_tick)
         # 创建策略计算回调函数对象，用于接收策略计算事件
         self.cb_stra_calc = CB_STRATEGY_CALC(self.on_stra_calc)
         # 创建K线闭合回调函数对象，用于接收K线闭合事件